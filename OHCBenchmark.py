@@ -0,0 +1,348 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2025 Mark Wasserman, Huawei
+Copyright (c) 2025 Gregor Olenik, TUM
+Copyright (c) 2025 Sergey Lesnik, Wikki GmbH
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the “Software”), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# generator of synthetic OHC submissions and ingest benchmarks of OHCParser
+import os
+import argparse
+import concurrent.futures
+import tempfile
+import contextlib
+import time
+import numpy as np
+import pandas as pd
+import openpyxl
+import OHCParser as op
+
+# rows of the META Data sheet as (label, value), the values are filled in by
+# generate_submission if they are None
+meta_rows = [
+    ("Required Input:", ""), (None, ""), ("DrivAer Test Case:", "Test case 2a"), (None, ""),
+    ("Submission relates to:", None), (None, ""), ("Identification", ""),
+    ("Participant ID (Participant List):", None), ("Lastname:", "Synthetic"), ("Firstname:", "Submission"),
+    ("Affiliation:", None), ("Email:", "synthetic@example.com"), ("Date:", "2025-06-22"),
+    ("Legend Suffix:", None), ("Plot Legend (automatically generated):", None), (None, ""),
+    ("CFD Software", ""), ("CFD Software", "OpenFOAM"), ("Flavor", None),
+    ('if "CFD Software: Other" - CFD Software:', ""), ("CFD Software Version", "2412"), (None, ""),
+    ("Mesh", ""), ("Selected Mesh", None), (None, ""), ("Comments (Optional):", ""),
+]
+
+# labels of the Simulations sheet which are edited as in the real submissions,
+# e.g. with different units, the first 12 characters stay unique, see LabelIndex
+sim_labels = {
+    "Time for pre-processing [s]:": ["Time for pre-processing [s]:", "Time for pre-processing [sec]:"],
+    "Total energy to completion [kW*h or J]:": [
+        "Total energy to completion [kW*h or J]:", "Total energy to completion [kWh]:"],
+    "Memory capacity per node:": ["Memory capacity per node:", "Memory capacity per node [GB]:"],
+}
+
+# layout of the Simulations sheet as (label, sublabel, example value), the
+# example column terminates the values of some fields, see take_till
+sim_rows = [
+    ("Required Input:", None, None), (None, None, None), (None, None, None), ("Software", None, None),
+    ("Solver Type:", None, None), ("Compressibility:", None, None),
+    (None, "Pressure/ Density Based:", None), (None, "Segregate/Coupled:", None),
+    (None, "Velocity convection scheme:", None), (None, "Order of accuracy (space/time):", None),
+    (None, "Steady-State/Transient:", None),
+    ("Time for pre-processing [s]:", None, 0),
+    ("Wall-clock time to completion excl. pre-processing [s]:", None, 3600),
+    ("Wall-clock time per timestep/iteration [s]:", None, 24),
+    ("TDP of system (CPU+Accelerator) [W]:", None, 500),
+    ("Total energy to completion [kW*h or J]:", None, None),
+    ("Decomposition Method:", None, "Scotch"), ("Renumbering Method:", None, "RCM"), (None, None, None),
+    ("Hardware:", None, None), ("Server Type:", None, "CPU"),
+    ("Hardware Spec (CPU):", None, "AMD EPYC 7371 3.2 GHz"), ("Hardware Spec (GPU):", None, None),
+    ("# of nodes used:", None, 4), ("# of CPU cores used:", None, 64), ("# of GPUs used:", None, 1),
+    ("Memory type:", None, "DDR4"), ("Memory capacity per node:", None, "256GB"),
+    ("Last-level Cache (LLC):", None, "64GB"), ("Network Interconnect:", None, "Infiniband"),
+    ("Storage Device:", None, None), ("Storage File-system:", None, "Lustre"),
+    ("Network Topology:", None, "Fat-tree"), (None, None, None), (None, None, None), (None, None, None),
+    ("Comments (Optional):", None, None), ("Attach log file (optional) and input files (optional)", None, None),
+]
+
+# column of the example values of the Simulations sheet
+example_column = 12
+
+# labels of the Meancalc table of the Aero Forces sheet starting at row 26
+meancalc_labels = [
+    "Total timesteps [nread]", "Averaging start timestep [nskip]", "Averaging samples [nused]",
+    "Mean value m", "Error Mean Value s(m)", "95% conf. int. on mean 2*s(m)",
+    "Standard deviation s", "Error Standard Deviation s(s)",
+]
+
+# final means and standard deviations of the force coefficients
+force_means = {"CD": (0.266, 0.005), "CL": (0.088, 0.017), "CS": (0.018, 0.011)}
+
+meshes = {"Coarse": 65e6, "Medium": 110e6, "Fine": 236e6}
+
+def pick(rng, values):
+    """ returns a random element of values"""
+    return values[rng.integers(len(values))]
+
+def sheet_rows(rows):
+    """ prepends the header row which pd.read_excel consumes, see read_sheet"""
+    return [[]] + rows
+
+def meta_sheet(rng, contributor, track, mesh):
+    """ returns the rows of the META Data sheet"""
+    values = {
+        "Submission relates to:": track,
+        "Participant ID (Participant List):": contributor,
+        "Affiliation:": pick(rng, list(op.affil_map) + ["Synthetic HPC Center", "Synthetic University"]),
+        "Legend Suffix:": mesh.lower(),
+        "Plot Legend (automatically generated):": f"ID{contributor}_OpenFOAM_{mesh.lower()}",
+        "Flavor": pick(rng, ["ESI (.com)", "Foundation (.org)", "Extend"]),
+        "Selected Mesh": mesh,
+    }
+    rows = []
+    for label, value in meta_rows:
+        value = values.get(label, value)
+        rows.append([None, label, None, value or None, None])
+    return sheet_rows(rows)
+
+def simulations_sheet(rng, mesh, num_sims):
+    """ returns the rows of the Simulations sheet with num_sims runs and the time per iteration of the runs"""
+    catalog = op.load_hardware_catalog()[0]
+    cpus = catalog[(catalog["Kind"] == "CPU") & catalog["Cores per Socket"].notna() & (catalog["Model"] != "Instinct")]
+    cpu = cpus.iloc[rng.integers(len(cpus))]
+    cpu_spec = f"{cpu['Family']} {cpu['Model']} {cpu['Submodel']}"
+    cores_per_node = int(2 * cpu["Cores per Socket"])
+    nodes = np.sort(rng.choice([1, 2, 4, 8, 16, 32], size=num_sims))
+    cores = nodes * cores_per_node
+    cells_per_core = meshes[mesh] / cores
+    time_per_iteration = cells_per_core / rng.uniform(2e4, 1.5e5) * rng.uniform(0.9, 1.1, num_sims)
+    tdp = nodes * 2 * (cpu["TDP [W]"] if not pd.isna(cpu["TDP [W]"]) else 300)
+    energy_kwh = tdp * time_per_iteration * 4000 / 3.6e6
+
+    values = {
+        "Time for pre-processing [s]:": list(rng.uniform(100, 3000, num_sims).round(3)),
+        "Wall-clock time to completion excl. pre-processing [s]:": list((time_per_iteration * 4000).round(2)),
+        "Wall-clock time per timestep/iteration [s]:": list(time_per_iteration.round(6)),
+        "TDP of system (CPU+Accelerator) [W]:": [f"{t:.0f} W" if rng.random() < 0.2 else float(t) for t in tdp],
+        "Total energy to completion [kW*h or J]:": list(energy_kwh.round(6)),
+        "Decomposition Method:": [pick(rng, ["Hierarchical", "Scotch", "Metis"])] * num_sims,
+        "Renumbering Method:": [pick(rng, ["RCM", "CuthillMcKee", "N/A"])] * num_sims,
+        "Server Type:": ["CPU"] * num_sims,
+        "Hardware Spec (CPU):": [cpu_spec] * num_sims,
+        "Hardware Spec (GPU):": ["N/A"] * num_sims,
+        "# of nodes used:": list(nodes),
+        "# of CPU cores used:": list(cores),
+        "# of GPUs used:": [0] * num_sims,
+        "Memory type:": ["DDR5-4800"] * num_sims,
+        "Memory capacity per node:": ["512GB"] * num_sims,
+        "Last-level Cache (LLC):": [f"{cpu['Last-Level Cache [MB]']:.0f}MB"] * num_sims,
+        "Network Interconnect:": [pick(rng, ["Infiniband NDR 200", "Slingshot 11", "100GbE"])] * num_sims,
+        "Storage File-system:": [pick(rng, ["Lustre", "GPFS", "NFS"])] * num_sims,
+    }
+    # gaps as in the real submissions, e.g. partial runs or unmeasured energy
+    if rng.random() < 0.2:
+        values["Time for pre-processing [s]:"] = ["N/A"] * num_sims
+    if rng.random() < 0.2:
+        values["Total energy to completion [kW*h or J]:"] = ["N/A"] * num_sims
+    elif rng.random() < 0.2:
+        values["Total energy to completion [kW*h or J]:"] = list((energy_kwh * 3.6e6).round(0))
+    if rng.random() < 0.1:
+        values["Wall-clock time to completion excl. pre-processing [s]:"][-1] = "N/A"
+
+    rows = []
+    for label, sublabel, example in sim_rows:
+        row = [None] * (example_column + 1)
+        row[1] = pick(rng, sim_labels[label]) if label in sim_labels else label
+        row[2] = sublabel
+        if label == "Software":
+            row[3:3+num_sims] = [f"Simulation #{i+1}" for i in range(num_sims)]
+        elif label in values:
+            row[3:3+num_sims] = values[label]
+        row[example_column] = example
+        rows.append(row)
+    return sheet_rows(rows), time_per_iteration
+
+def force_history(rng, num_iterations, time_per_iteration):
+    """ returns the iteration, wall-clock time and CD, CL, CS histories of a run"""
+    iteration = np.arange(1, num_iterations + 1)
+    wct = np.concatenate([[0], np.cumsum(rng.normal(time_per_iteration, 0.05 * time_per_iteration, num_iterations - 1))])
+    tau = rng.uniform(100, 800)
+    history = {}
+    for name, (mean, std) in force_means.items():
+        mean = rng.normal(mean, std / 4)
+        start = mean + rng.normal(0, 20 * std)
+        # slow oscillations of the converged solution and noise
+        oscillation = std * np.sin(2 * np.pi * iteration / rng.uniform(200, 600) + rng.uniform(0, 2 * np.pi))
+        history[name] = mean + (start - mean) * np.exp(-iteration / tau) + oscillation + rng.normal(0, std / 3, num_iterations)
+    return iteration, wct, history
+
+def forces_sheet(rng, num_iterations, time_per_iteration):
+    """ returns the rows of the Aero Forces sheet"""
+    iteration, wct, history = force_history(rng, num_iterations, time_per_iteration)
+    skip = num_iterations // 2
+    rows = [[None] * 14 for _ in range(max(num_iterations + 2, 34))]
+    rows[0][2] = "Aerodynamics Forces"
+    rows[8][2:6] = ["Aero Force Coeff:", "CD", "CL", "CS"]
+    for i, label in enumerate(meancalc_labels):
+        rows[26 + i][2] = label
+    if rng.random() < 0.5:
+        tail = {name: values[skip:] for name, values in history.items()}
+        rows[26][3:6] = [num_iterations] * 3
+        rows[27][3:6] = [skip] * 3
+        rows[28][3:6] = [num_iterations - skip] * 3
+        rows[29][3:6] = [float(v.mean()) for v in tail.values()]
+        rows[30][3:6] = [float(v.std() / np.sqrt(len(v) / 50)) for v in tail.values()]
+        rows[31][3:6] = [float(2 * v.std() / np.sqrt(len(v) / 50)) for v in tail.values()]
+        rows[32][3:6] = [float(v.std()) for v in tail.values()]
+    else:
+        rows[31][3:6] = [0, 0, 0]
+    rows[0][9] = "Simulation Convergence (Fastest, Simulation #1)\n(history)"
+    rows[1][9:14] = ["Time [iter]", "Wall-clock time [s]", "CD [-]", "CL [-]", "CS [-]"]
+    for i in range(num_iterations):
+        rows[2 + i][9:14] = [int(iteration[i]), float(wct[i]), float(history["CD"][i]),
+                             float(history["CL"][i]), float(history["CS"][i])]
+    return sheet_rows(rows)
+
+def generate_submission(file_name, seed=0, num_iterations=4000):
+    """ writes a synthetic submission with the layout of the OHC template to file_name
+
+    The workbook has the META Data, Simulations and Aero Forces sheets with
+    the row labels read by OHCParser, including edited units, N/A gaps and
+    a force history of num_iterations iterations. The content is determined
+    by seed.
+    """
+    rng = np.random.default_rng(seed)
+    contributor = f"{rng.integers(1, 100):02d}"
+    track = pick(rng, ["Hardware Track", "Software Track"])
+    mesh = pick(rng, list(meshes))
+    sim_sheet, time_per_iteration = simulations_sheet(rng, mesh, int(rng.integers(1, 9)))
+    sheets = {
+        "META Data": meta_sheet(rng, contributor, track, mesh),
+        "Simulations": sim_sheet,
+        "Aero Forces": forces_sheet(rng, num_iterations, float(time_per_iteration.min())),
+    }
+    wb = openpyxl.Workbook(write_only=True)
+    for name, rows in sheets.items():
+        ws = wb.create_sheet(name)
+        for row in rows:
+            ws.append(row)
+    wb.save(file_name)
+
+def submission_name(i):
+    """ returns the file name of the i-th synthetic submission"""
+    return f"{i % 100:02d}_OHC1_DrivAer_Result_Synthetic_{i:05d}.xlsm"
+
+def generate_submissions(folder_name, count, seed=0, jobs=1, num_iterations=4000):
+    """ writes count synthetic submissions to folder_name, existing files are kept
+
+    The i-th submission is generated with seed + i, hence a folder can be
+    grown by calling this function with a larger count.
+    """
+    os.makedirs(folder_name, exist_ok=True)
+    todo = [i for i in range(count) if not os.path.exists(os.path.join(folder_name, submission_name(i)))]
+    args = ([os.path.join(folder_name, submission_name(i)) for i in todo], [seed + i for i in todo],
+            [num_iterations] * len(todo))
+    if jobs is None:
+        jobs = os.cpu_count()
+    if jobs > 1 and len(todo) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(todo))) as pool:
+            list(pool.map(generate_submission, *args, chunksize=16))
+    else:
+        list(map(generate_submission, *args))
+
+def link_submissions(source, folder_name, count):
+    """ creates folder_name with links to the first count submissions of source"""
+    os.makedirs(folder_name, exist_ok=True)
+    for i in range(count):
+        target = os.path.join(folder_name, submission_name(i))
+        if not os.path.exists(target):
+            os.symlink(os.path.abspath(os.path.join(source, submission_name(i))), target)
+
+def benchmark_ingest(folder_name, jobs=1):
+    """ ingests, derives and exports the submissions in folder_name
+
+    Returns one row per stage with the number of files and rows, the wall
+    time, the files/s and rows/s and the peak RSS of the process and of the
+    worker processes of the ingest.
+    """
+    num_files = len([fn for fn in op.list_files(folder_name) if fn.endswith("xlsm")])
+    rows = {}
+    with op.profiling() as prof:
+        with op.profile("ingest"):
+            dfs, dff = op.collect_submissions(folder_name, jobs=jobs, forces=True)
+        rows["ingest"] = len(dfs) + len(dff)
+        with op.profile("derive"):
+            dfs = op.derive_metrics(dfs)
+        rows["derive"] = len(dfs)
+        with tempfile.TemporaryDirectory() as store:
+            with op.profile("export"):
+                op.export_store(dfs, dff, store)
+        rows["export"] = len(dfs) + len(dff)
+
+    records = prof.frame()
+    df = records[records["Stage"].isin(rows)][["Stage", "Wall Time [s]", "CPU Time [s]", "Max RSS [MB]"]]
+    df = df.rename(columns={"Max RSS [MB]": "Peak RSS [MB]"})
+    # with jobs > 1 the workbooks are parsed in worker processes
+    workers = records[records["Process"] != os.getpid()]
+    df["Peak Worker RSS [MB]"] = np.where(df["Stage"] == "ingest", workers["Max RSS [MB]"].max(), np.nan)
+    df.insert(1, "Files", num_files)
+    df.insert(2, "Rows", df["Stage"].map(rows))
+    df["Files/s"] = df["Files"] / df["Wall Time [s]"]
+    df["Rows/s"] = df["Rows"] / df["Wall Time [s]"]
+    return df.reset_index(drop=True)
+
+def run_benchmarks(counts=(10, 100, 1000, 10000), folder_name="benchmark_submissions", jobs=1, seed=0):
+    """ runs benchmark_ingest for folders with count synthetic submissions each
+
+    The submissions are generated once into folder_name/all, every count is
+    benchmarked in a fresh process such that the peak RSS is per count.
+    """
+    source = os.path.join(folder_name, "all")
+    start = time.perf_counter()
+    generate_submissions(source, max(counts), seed, jobs)
+    print(f"generated {max(counts)} submissions in {time.perf_counter() - start:.1f} s")
+    dfs = []
+    for count in counts:
+        folder = os.path.join(folder_name, str(count))
+        link_submissions(source, folder, count)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1) as pool:
+            df = pool.submit(quiet_benchmark_ingest, folder, jobs).result()
+        print(df.to_string(index=False))
+        dfs.append(df.assign(Count=count))
+    return pd.concat(dfs, ignore_index=True)
+
+def quiet_benchmark_ingest(folder_name, jobs=1):
+    """ benchmark_ingest without the messages of the parser"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return benchmark_ingest(folder_name, jobs)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmarks the ingest of synthetic OHC submissions")
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000, 10000],
+                        help="numbers of submissions to benchmark")
+    parser.add_argument("--folder", default="benchmark_submissions",
+                        help="folder of the generated submissions")
+    parser.add_argument("--jobs", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="writes the results to this csv file")
+    args = parser.parse_args()
+    df = run_benchmarks(args.counts, args.folder, args.jobs, args.seed)
+    if args.output:
+        df.to_csv(args.output, index=False)
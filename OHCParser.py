@@ -28,126 +28,136 @@ SOFTWARE.
 # helper functions
 import re
 import warnings
+import numpy as np
 import pandas as pd
 from functools import partial
 import os
 import datetime
 import traceback
 import pathlib
-import matplotlib.pyplot as plt
+import io
+import contextlib
+import concurrent.futures
+import collections
+import hashlib
+import pickle
+import mmap
+import tarfile
+import gzip
+import lzma
+import bz2
+import fnmatch
+import functools
+import bisect
+import json
+import sys
+import time
+import tracemalloc
+import getpass
+import argparse
+import inspect
+import multiprocessing
+import sqlite3
+try:
+    import resource
+except ImportError:
+    resource = None
+# matplotlib is only needed to save figures and imported by save_fig, thus
+# headless jobs neither pay for its import nor need a display backend
 
-def get_cpu_model(fn, s):
-    """ given the processor string this functions returns common model names"""
-    ls = s.lower()
-    generation = "Unknown"
-
-    if "intel" in ls or "xeon" in ls:
-        family = "Intel"
-        if "core" in ls and "i9-14900" in ls:
-            model = "Core"
-            submodel = "i9-14900ks"
-            generation = "i9"
-        elif "xeon" in ls:
-            model = "Xeon"
-            match = re.search(r'(?<!\d)\d{4}(?!\d)', ls)
-            if not match:
-                match = re.search(r'(?<!\d)\d[a-z]\d{2}(?!\d)', ls)
-                if not match:
-                    submodel = "Other"
-                    print(f"{fn}: Unknown CPU submodel: {ls}")
-                    return family,model,submodel,generation
-
-            submodel = match.group()
-            if submodel[1] == "1":
-                generation = "Skylake (1st-gen)"
-            elif submodel[1] == "2":
-                generation = "Cascade Lake (2nd-gen)"
-            elif submodel[1] == "3":
-                generation = "Ice Lake (3rd-gen)"
-            elif submodel[1] == "4":
-                generation = "Sapphire Rapids (4th-gen)"
-            elif submodel[1] == "5":
-                generation = "Emerald Rapids (5th-gen)"
-            elif submodel[0] == "2" and submodel[1] == "6":
-                generation = "Broadwell"
-            else:
-                generation = "Unknown"
-            return family,model,submodel,generation
-        else:
-            print(f"{fn}: Unknown CPU model {ls}")
-
-
-        return family,model,submodel,generation
-
-    if "amd" in ls or "epyc" in ls:
-        family = "AMD"
-        if "instinct" in ls:
-            model = "Instinct"
-            submodel = "MI300A"
-        elif "epyc" in ls:
-            model = "EPYC"
-            match = re.search(r'(?<!\d)\d{4}(?!\d)', ls)
-            if not match:
-                match = re.search(r'(?<!\d)\d[a-z]\d{2}(?!\d)', ls)
-                if not match:
-                    submodel = "Other"
-                    print(f"{fn}: Unknown CPU submodel: {ls}")
-                    return family,model,submodel,generation
-
-            submodel = match.group()
-            if submodel[-1] == "5":
-                generation = "Turin (5th-gen)"
-            elif submodel[-1] == "4":
-                generation = "Genoa (4th-gen)"
-            elif submodel[-1] == "3":
-                generation = "Milan (3rd-gen)"
-            elif submodel[-1] == "2":
-                generation = "Rome (2nd-gen)"
-            elif submodel[-1] == "1":
-                generation = "Naples (1st-gen)"
-            else:
-                generation = "Unknown"
-            return family,model,submodel,generation
-        else:
-            print(f"{fn}: Unknown CPU model {ls}")
-
-        return family,model,submodel,generation
-
-    if "arm" in ls or "lx2" in ls or "fujitsu" in ls:
-        family = "ARM"
-        if "lx2" in ls:
-            model = "LX2"
-            submodel = "High-Performance"
-            generation = "ARMv9"
-        elif "a64fx" in ls:
-            model = "Fujitsu"
-            submodel = "A64FX"
-            generation = "ARMv8.2"
-        elif "grace" in ls:
-            model = "Neoverse"
-            submodel = "v2"
-            generation = "ARMv9"
-        else:
-            model = "Other"
-            submodel = "Other"
-            print(f"{fn}: Unknown CPU model {ls}")
+# table of known CPUs and GPUs, see load_hardware_catalog
+hardware_catalog_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hardware_catalog.csv")
 
-        return family,model,submodel,generation
+hardware_specs = ["Cores per Socket", "Memory Channels", "Peak Memory Bandwidth [GB/s]",
+                  "Last-Level Cache [MB]", "TDP [W]"]
 
-    print(f"{fn}: Unknown CPU {ls}")
-    return "Unknown","Unknown","Unknown","Unknown"
+@functools.lru_cache
+def load_hardware_catalog(file_name=hardware_catalog_file):
+    """ reads the hardware catalog and compiles its patterns
 
-def get_gpu_model(fn, s):
+    Every row of the catalog has a Kind (CPU or GPU), a regular expression
+    Pattern which is searched for in the lower case spec string, an optional
+    regular expression Number which has to match the model number of the
+    spec string, see model_number, the names Family, Model, Submodel and
+    Generation and the nominal per socket (or per device) specs. The first
+    matching row is used, hence specific models are listed before generic
+    ones. If Submodel is empty it is the model number, such rows give the
+    specs of a generation.
+    """
+    catalog = pd.read_csv(file_name, dtype={"Number": str, "Submodel": str})
+    patterns = [(kind, re.compile(pattern), None if pd.isna(number) else re.compile(number), row)
+                for kind, pattern, number, row in zip(
+                    catalog["Kind"], catalog["Pattern"], catalog["Number"],
+                    catalog.drop(columns=["Kind", "Pattern", "Number"]).to_dict("records"))]
+    return catalog, patterns
+
+def model_number(ls):
+    """ returns the first four digit number of the spec string ls, e.g. 6348, else e.g. 7b13 or None"""
+    match = re.search(r'(?<!\d)\d{4}(?!\d)', ls) or re.search(r'(?<!\d)\d[a-z]\d{2}(?!\d)', ls)
+    return match.group() if match else None
+
+@functools.lru_cache(maxsize=None)
+def match_hardware(kind, s):
+    """ returns the first catalog row of kind matching the spec string s or None"""
     ls = s.lower()
-    if ls in ["n/a", "/"]:
+    number = model_number(ls)
+    for row_kind, pattern, number_pattern, row in load_hardware_catalog()[1]:
+        if row_kind != kind or not pattern.search(ls):
+            continue
+        if number_pattern is not None and (number is None or not number_pattern.fullmatch(number)):
+            continue
+        if pd.isna(row["Submodel"]):
+            row = dict(row, Submodel=number)
+        return row
+    return None
+
+def get_cpu_model(fn, s):
+    """ given the processor string this functions returns common model names"""
+    row = match_hardware("CPU", s)
+    if row is None:
+        diagnose(fn, "CPU Spec", s, "unknown CPU")
+        return "Unknown","Unknown","Unknown","Unknown"
+    if row["Submodel"] == "Other":
+        diagnose(fn, "CPU Spec", s, "unknown CPU model, set to Other")
+    return row["Family"], row["Model"], row["Submodel"], row["Generation"]
+
+def get_gpu_model(fn, s):
+    """ given the GPU string this functions returns common model names"""
+    if s.lower() in ["n/a", "/", "-", ""]:
         return "N/A"
-    if "nvidia a100" in ls:
-        return "NVIDIA A100-64"
-    if "a100-40" in ls:
-        return "NVIDIA A100-40"
-    if "mi100" in ls:
-        return "AMD MI100"
-    return "N/A"
+    row = match_hardware("GPU", s)
+    if row is None:
+        diagnose(fn, "GPU Spec", s, "unknown GPU")
+        return "Unknown"
+    return row["Model"]
+
+def get_hardware_specs(df):
+    """ returns the catalog specs of the CPU and GPU of every run of df
+
+    The CPU specs are looked up by CPU Family, Model and Submodel, CPUs
+    without an entry get the specs of their CPU Generation. The GPU specs are
+    looked up by GPU Model, the columns of the latter are prefixed with GPU.
+    """
+    catalog = load_hardware_catalog()[0]
+    cpus = catalog[catalog["Kind"] == "CPU"].rename(columns={
+        "Family": "CPU Family", "Model": "CPU Model", "Submodel": "CPU Submodel", "Generation": "CPU Generation"})
+    cpu_keys = ["CPU Family", "CPU Model", "CPU Submodel"]
+    generation_keys = ["CPU Family", "CPU Model", "CPU Generation"]
+    generations = cpus[cpus["CPU Submodel"].isna()].drop_duplicates(subset=generation_keys)
+    generations = generations[generation_keys + hardware_specs]
+    cpus = cpus.dropna(subset=["CPU Submodel"]).drop_duplicates(subset=cpu_keys)[cpu_keys + hardware_specs]
+    gpus = catalog[catalog["Kind"] == "GPU"].drop_duplicates(subset=["Model"])
+    gpus = gpus[["Model"] + hardware_specs].rename(columns=lambda c: "GPU " + c)
+
+    specs = df[cpu_keys + ["GPU Model"]].astype(str)
+    specs["CPU Generation"] = df["CPU Generation"].astype(str) if "CPU Generation" in df else ""
+    specs = specs.merge(cpus, on=cpu_keys, how="left")
+    fallback = specs[generation_keys].merge(generations, on=generation_keys, how="left")
+    known = specs[hardware_specs].notna().any(axis=1)
+    specs[hardware_specs] = specs[hardware_specs].where(known, fallback[hardware_specs])
+    specs = specs.merge(gpus, on="GPU Model", how="left")
+    specs.index = df.index
+    return specs[hardware_specs + ["GPU " + c for c in hardware_specs]]
 
 def get_software_track_type(fn):
     """ tries to deduce the type of submission based on the file name"""
@@ -226,6 +236,10 @@ def get_sim(df_in, field, terminator=None, num_vals = -1, has_separator=True, de
     if i < 0:
         warnings.warn(f"field {field} not found")
         return []
+    return get_row_values(df_in, i, terminator, num_vals, has_separator, default)
+
+def get_row_values(df_in, i, terminator=None, num_vals = -1, has_separator=True, default=None):
+    """ extracts the values of row i, see get_sim"""
     if terminator:
         return take_till(df_in, i, terminator)
     if num_vals >= 0:
@@ -249,96 +263,695 @@ def get_sim(df_in, field, terminator=None, num_vals = -1, has_separator=True, de
                 ret = [default for _ in range(num_vals)]
             return ret
 
+class LabelIndex:
+    """ one-time index of the row labels of a sheet
+
+    Answers the exact and fuzzy lookups of find_row without rescanning the
+    label column for every field. All lookups are recorded in matches.
+    """
+    def __init__(self, df_in):
+        # row names are stored in the column with name Unnamed: 1
+        vals = df_in["Unnamed: 1"].values
+        self.labels = [str(val) for val in vals]
+        self.rows = {}
+        for i, val in enumerate(vals):
+            self.rows.setdefault(val, i)
+        self.prefix_rows = {}
+        self.matches = {}
+
+    def find(self, name):
+        """ returns the row of name or -1, like find_row"""
+        i = self.rows.get(name, -1)
+        if i > 0:
+            self.matches[name] = (i, "exact")
+            return i
+        # people edited some row names by modifying the physical units, thus
+        # the first 12 characters are matched as a fallback
+        prefix = name[0:12]
+        if prefix not in self.prefix_rows:
+            self.prefix_rows[prefix] = next((i for i, val in enumerate(self.labels) if prefix in val), -1)
+        i = self.prefix_rows[prefix]
+        if i < 0:
+            warnings.warn(f"could not find column {name}")
+        self.matches[name] = (i, "fuzzy" if i >= 0 else "missing")
+        return i
+
+    def match_report(self):
+        """ returns a dataframe listing how each looked up field was matched"""
+        return pd.DataFrame(
+            [(name, i, self.labels[i] if i >= 0 else None, how) for name, (i, how) in self.matches.items()],
+            columns=["Field", "Row", "Row Label", "Match"])
+
 # def get_timeseries()
 
-def to_float(fn, what, s):
+# the active list of diagnostics, None if they are printed, see diagnosing
+collected_diagnostics = None
+
+diagnostics_columns = ["File", "Field", "Raw Value", "Action"]
+
+def diagnose(fn, what, raw, action):
+    """ records a problem with a value of a submission and the action taken
+
+    The records are collected by diagnosing, without an active collection
+    they are printed.
+    """
+    if collected_diagnostics is None:
+        print(f"{fn}: {what} {raw}: {action}")
+    else:
+        collected_diagnostics.append((fn, what, None if raw is None else str(raw), action))
+
+def diagnose_all(fn, what, values, action):
+    """ records the same action for every value, see diagnose"""
+    for v in values:
+        diagnose(fn, what, v, action)
+
+@contextlib.contextmanager
+def diagnosing():
+    """ collects the diagnose records instead of printing them and yields the list"""
+    global collected_diagnostics
+    previous = collected_diagnostics
+    collected_diagnostics = []
+    try:
+        yield collected_diagnostics
+    finally:
+        collected_diagnostics = previous
+
+def diagnostics_frame(records):
+    """ returns the diagnose records as a DataFrame"""
+    return pd.DataFrame.from_records(records, columns=diagnostics_columns)
+
+# lower case strings which are reported as missing values by the converters,
+# in addition to the na_strings of the sheet reader
+missing_strings = {"", "-", "--", "/", "n/a", "na", "nan", "none", "null", "tbd"}
+
+def to_floats(fn, what, values, fill=1e-16, missing=None):
+    """ converts a whole array to floats
+
+    Values that cannot be converted are replaced by fill, strings of
+    missing_strings by missing which defaults to fill. Both are recorded, see
+    diagnose, as are numbers given as strings.
+    """
+    missing = fill if missing is None else missing
+    values = pd.Series(values, dtype=object)
+    out = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float, copy=True)
+    strings = values.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+    # e.g. numbers with surrounding white space
+    diagnose_all(fn, what, values[strings & ~np.isnan(out)], "read as number")
+    failed = np.flatnonzero(np.isnan(out) & values.notna().to_numpy())
+    for i in failed:
+        v = values.iloc[i]
+        try:
+            out[i] = float(v)
+            diagnose(fn, what, v, "read as number")
+        except (TypeError, ValueError):
+            if str(v).strip().lower() in missing_strings:
+                diagnose(fn, what, v, "read as missing" if np.isnan(missing) else f"missing, replaced by {missing}")
+                out[i] = missing
+            else:
+                diagnose(fn, what, v, "not a number, read as missing" if np.isnan(fill) else f"replaced by {fill}")
+                out[i] = fill
+    return out
+
+def to_counts(fn, what, values, missing=np.nan):
+    """ converts numbers of nodes, cores or devices to floats, see to_floats
+
+    Missing values become missing, which can be changed by missing, values
+    that cannot be converted become missing as well.
+    """
+    return to_floats(fn, what, values, fill=np.nan, missing=missing)
+
+def to_seconds(fn, what, values):
+    """ converts durations to seconds, see to_floats
+
+    Durations entered as time of day (h:m:s cells) are converted to seconds,
+    missing and other values that cannot be converted become missing.
+    """
+    values = pd.Series(values, dtype=object).to_numpy(copy=True)
+    for i, v in enumerate(values):
+        if isinstance(v, datetime.time):
+            values[i] = 3600 * v.hour + 60 * v.minute + v.second + v.microsecond / 1e6
+            diagnose(fn, what, v, f"read as h:m:s, converted to {values[i]:g} s")
+        elif isinstance(v, datetime.timedelta):
+            values[i] = v.total_seconds()
+            diagnose(fn, what, v, f"read as duration, converted to {values[i]:g} s")
+    return to_floats(fn, what, values, fill=np.nan)
+
+def to_floats_or_raise(fn, what, values):
+    """ converts a whole array to floats, raises a ValueError if a value cannot be converted"""
+    try:
+        return np.asarray(values, dtype=float).reshape(-1)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{fn}: cannot convert {what} to float: {e}") from e
+
+def to_tdp(fn, what, values):
+    """ converts TDPs to floats
+
+    Units are removed (500 W, 1.2 kW) and dashes are read as 0 like the
+    default of the field, see to_floats.
+    """
+    values = pd.Series(values, dtype=object).to_numpy(copy=True)
+    strings = np.flatnonzero([isinstance(v, str) for v in values])
+    if len(strings):
+        text = pd.Series(values[strings], dtype=str).str.strip()
+        power = text.str.extract(r"^([-+]?[\d.]+(?:[eE][-+]?\d+)?)\s*(k?)W$", flags=re.I)
+        has_unit = power[0].notna().to_numpy()
+        watts = pd.to_numeric(power[0], errors="coerce") * np.where(power[1].str.lower() == "k", 1000, 1)
+        missing = text.str.fullmatch(r"-+").to_numpy(dtype=bool)
+        for i in np.flatnonzero(has_unit & watts.notna().to_numpy()):
+            diagnose(fn, what, values[strings[i]], f"removed unit, read as {watts[i]:g}")
+            values[strings[i]] = watts[i]
+        for i in np.flatnonzero(missing):
+            diagnose(fn, what, values[strings[i]], "read as 0")
+            values[strings[i]] = 0.0
+    return to_floats(fn, what, values)
+
+def to_energy(fn, what, values):
+    """ converts energies to kWh, some are given in J thus values of at least 1000 are considered to be in J"""
+    out = to_floats(fn, what, values)
+    joules = out >= 1000
+    diagnose_all(fn, what, out[joules], "read as J, converted to kWh")
+    out[joules] /= 3.6e6
+    return out
+
+# declarative description of the fields that are extracted from the sheets
+#   column: name of the output column
+#   label: row label, values are in the following columns
+#   terminator: values are taken until this value is found, otherwise one
+#       value per run is taken
+#   default: used for every run if not all runs have a value
+#   converter: applied to all values as converter(filename, column, values)
+#   has_separator: the row contains a separator value after the run values
+Field = collections.namedtuple(
+    "Field", ["column", "label", "terminator", "default", "converter", "has_separator"],
+    defaults=(None, None, None, True))
+
+meta_table = (
+    Field("Contributor Affiliation", "Affiliation:"),
+    Field("Mesh", "Selected Mesh"),
+    Field("Track", "Submission relates to:"),
+    Field("OpenFOAM Flavor", "Flavor"),
+)
+
+# the number of time per iteration values serves as a single source of truth
+# for the number of runs, thus it has to be the first field
+sim_table = (
+    Field("Time per Iteration [s]", "Wall-clock time per timestep/iteration [s]:", terminator=24, converter=to_floats_or_raise),
+    Field("Run Wall-Clock Time [s]", "Wall-clock time to completion excl. pre-processing [s]:", terminator=3600),
+    Field("Pre-Processing Wall-Clock Time [s]", "Time for pre-processing [s]:", default="N/A", converter=to_seconds),
+    Field("Number of Nodes", "# of nodes used:", converter=to_counts),
+    Field("Number of CPU Cores", "# of CPU cores used:", converter=to_counts),
+    Field("CPU Spec", "Hardware Spec (CPU):"),
+    Field("GPU Spec", "Hardware Spec (GPU):", default="N/A"),
+    Field("Number of GPU Devices", "# of GPUs used:", default=0, converter=partial(to_counts, missing=0.0)),
+    Field("System TDP [W]", "TDP of system (CPU+Accelerator) [W]:", default=0.0, converter=to_tdp),
+    Field("Run Consumed Energy [kWh]", "Total energy to completion [kW*h or J]:", converter=to_energy, has_separator=False),
+    Field("Decomposition Method", "Decomposition Method Method:", default="N/A"),
+    Field("Last-Level Cache", "Last-level Cache (Last-Level Cache):", default="N/A"),
+    Field("Network Interconnect", "Network Interconnect Interconnect:", default="N/A"),
+    Field("Renumbering Method", "Renumbering Method Method:", default="N/A"),
+    Field("Storage File-System", "Storage File-system:", default="N/A"),
+)
+
+# raw fields which are only used to derive other columns
+raw_columns = ["CPU Spec", "GPU Spec"]
+
+# labels of the rows that are read from the Simulations sheet
+sim_fields = tuple(field.label for field in sim_table)
+
+def extract_meta(index, df_in, table=meta_table):
+    """ extracts the meta data fields of the table, values are in column 3"""
+    out = {}
+    for field in table:
+        out[field.column] = df_in.loc[index.find(field.label)].values[3]
+    return out
+
+def extract_sim(index, df_in, filename, table=sim_table):
+    """ extracts the simulation fields of the table
+
+    Returns a dict of lists with the values per run for every column.
+    """
+    out = {}
+    num_entries = -1
+    for field in table:
+        i = index.find(field.label)
+        if i < 0:
+            warnings.warn(f"field {field.label} not found")
+            values = []
+        else:
+            values = get_row_values(df_in, i, field.terminator, num_entries, field.has_separator, field.default)
+        if field.converter and values is not None:
+            values = field.converter(filename, field.column, values)
+        out[field.column] = list(values) if values is not None else None
+        if num_entries < 0:
+            num_entries = len(out[field.column])
+    return out
+
+def field_matches(df_in, df_meta):
+    """ reports how the fields of the Simulations and META Data sheets were matched
+
+    Fields found by the fuzzy fallback of find_row are marked as fuzzy.
+    """
+    meta_index = LabelIndex(df_meta)
+    extract_meta(meta_index, df_meta)
+    sim_index = LabelIndex(df_in)
+    extract_sim(sim_index, df_in, "")
+    return pd.concat([
+        meta_index.match_report().assign(Sheet="META Data"),
+        sim_index.match_report().assign(Sheet="Simulations")], ignore_index=True)
+
+# the active Profiler, None if profiling is disabled, see profiling
+profiler = None
+
+class Profiler:
+    """ collects wall time, CPU time and memory records of profiled stages
+
+    Every record holds the Stage, the File it belongs to (if any), the
+    Process it ran in, its Start Time, Wall Time [s], CPU Time [s] and the
+    Max RSS [MB] of the process at its end. With trace_memory also the Peak
+    Traced Memory [MB] allocated by python during the stage is recorded,
+    which slows down the profiled code considerably. Stages can be nested,
+    e.g. get_cpu_model is part of serialize. The hooks are called with every
+    new record.
+    """
+    def __init__(self, trace_memory=False, hooks=()):
+        self.records = []
+        self.trace_memory = trace_memory
+        self.hooks = list(hooks)
+        self.peaks = []
+
+    def add(self, record):
+        self.records.append(record)
+        for hook in self.hooks:
+            hook(record)
+
+    @contextlib.contextmanager
+    def stage(self, stage, file_name="", **info):
+        if self.trace_memory:
+            # the peak is reset for every stage, hence it is handed to the enclosing stage
+            if self.peaks:
+                self.peaks[-1] = max(self.peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self.peaks.append(0)
+        start = time.time()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            record = {
+                "Stage": stage,
+                "File": file_name,
+                **info,
+                "Process": os.getpid(),
+                "Start Time": start,
+                "Wall Time [s]": time.perf_counter() - wall,
+                "CPU Time [s]": time.process_time() - cpu,
+                "Max RSS [MB]": max_rss(),
+            }
+            if self.trace_memory:
+                peak = max(self.peaks.pop(), tracemalloc.get_traced_memory()[1])
+                if self.peaks:
+                    self.peaks[-1] = max(self.peaks[-1], peak)
+                record["Peak Traced Memory [MB]"] = peak / 2**20
+            self.add(record)
+
+    def frame(self):
+        """ returns the records as a DataFrame"""
+        return pd.DataFrame.from_records(self.records)
+
+    def write_trace(self, file_name):
+        """ writes the records as JSON lines"""
+        with open(file_name, "w") as f:
+            for record in self.records:
+                f.write(json.dumps(record) + "\n")
+
+def max_rss():
+    """ returns the peak resident set size of the process in MB or NaN if unknown"""
+    if resource is None:
+        return float("nan")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return rss / 2**20 if sys.platform == "darwin" else rss / 2**10
+
+@contextlib.contextmanager
+def profiling(trace_memory=False, hooks=()):
+    """ enables profiling of the ingest stages and yields the Profiler
+
+    Stages run in worker processes, see collect_submissions, are recorded
+    too. Without an active profiling context the instrumentation is a single
+    check per stage. Example:
+
+        with op.profiling() as prof:
+            dfs = op.derive_metrics(op.read_submissions())
+        prof.frame().groupby("Stage")["Wall Time [s]"].sum()
+    """
+    global profiler
+    previous = profiler
+    profiler = Profiler(trace_memory, hooks)
+    started = trace_memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
     try:
-        return float(s)
-    except:
-        print(f"{fn}: failed to convert {s} {what} to float")
-        return 1e-16
+        yield profiler
+    finally:
+        if started:
+            tracemalloc.stop()
+        profiler = previous
+
+no_profile = contextlib.nullcontext()
+
+def profile(stage, file_name="", **info):
+    """ returns a context manager which records stage if profiling is enabled, see profiling"""
+    if profiler is None:
+        return no_profile
+    return profiler.stage(stage, file_name, **info)
+
+def profiled(stage):
+    """ decorator which records every call of the function as stage, see profile"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# file name endings of (compressed) tar archives which can be read in place
+archive_suffixes = (".tar", ".tgz", ".txz", ".tbz2", ".gz", ".xz", ".bz2")
+
+def is_archive(path):
+    """ checks if path is a (compressed) tar archive"""
+    return os.path.isfile(path) and path.lower().endswith(archive_suffixes) and tarfile.is_tarfile(path)
+
+@functools.lru_cache(maxsize=None)
+def read_archive_index(path, mtime_ns, size):
+    """ decompresses the archive once and returns the offset and size of every file member"""
+    with tarfile.open(path, "r:*") as tf:
+        return {m.name: (m.offset_data, m.size) for m in tf if m.isfile()}
+
+def archive_index(path):
+    """ returns the member index of an archive, the index is built once per archive version"""
+    st = os.stat(path)
+    return read_archive_index(path, st.st_mtime_ns, st.st_size)
+
+def split_archive_path(path):
+    """ splits a path pointing into an archive, e.g. archive.tar.xz/dir/file, into the archive and member name
+
+    Returns (path, None) if path does not point into an archive.
+    """
+    if os.path.exists(path):
+        return path, None
+    parts = pathlib.PurePath(path).parts
+    for i in range(len(parts)-1, 0, -1):
+        prefix = os.path.join(*parts[:i])
+        if os.path.isfile(prefix):
+            if is_archive(prefix):
+                return prefix, "/".join(parts[i:])
+            break
+    return path, None
+
+# decompressing streams of the archives read so far, such that reading the
+# members in order only decompresses every archive once, see close_archives
+open_archives = {}
+
+# decompressed members of compressed archives, which were read or passed over
+# while seeking forward, such that members can also be read backwards or in
+# random order without decompressing the archive again from the start
+archive_members = {}
 
-def to_tdp(fn, what, s):
+# number of bytes kept in archive_members
+archive_members_bytes = 0
+
+# upper limit of the bytes kept in archive_members, members which do not fit
+# are decompressed again if they are read backwards
+archive_cache_bytes = 256 * 2**20
+
+def cache_member(key, name, data):
+    """ keeps a decompressed member in archive_members if it fits into archive_cache_bytes"""
+    global archive_members_bytes
+    if (key, name) not in archive_members and archive_members_bytes + len(data) <= archive_cache_bytes:
+        archive_members[key, name] = data
+        archive_members_bytes += len(data)
+
+def open_member(archive, member):
+    """ returns a member of an archive as file object
+
+    The member is located via the archive index and read by seeking the
+    decompressing stream, without extracting the archive. Members of
+    compressed archives are kept in archive_members.
+    """
+    st = os.stat(archive)
+    key = (archive, st.st_mtime_ns, st.st_size)
+    if (key, member) in archive_members:
+        return io.BytesIO(archive_members[key, member])
+    index = archive_index(archive)
+    offset, size = index[member]
+    if key not in open_archives:
+        open_archives[key] = tarfile.open(archive, "r:*")
+    stream = open_archives[key].fileobj
+    compressed = isinstance(stream, (gzip.GzipFile, lzma.LZMAFile, bz2.BZ2File))
+    if compressed:
+        # seeking backwards decompresses from the start, seeking forward
+        # decompresses the members in between anyway
+        position = stream.tell() if offset >= stream.tell() else 0
+        for name, (member_offset, member_size) in sorted(index.items(), key=lambda item: item[1]):
+            if position <= member_offset < offset and (key, name) not in archive_members:
+                stream.seek(member_offset)
+                cache_member(key, name, stream.read(member_size))
+    stream.seek(offset)
+    data = stream.read(size)
+    if compressed:
+        cache_member(key, member, data)
+    return io.BytesIO(data)
+
+def close_archives():
+    """ closes the streams of open_archives and drops the members kept in archive_members"""
+    global archive_members_bytes
+    for tf in open_archives.values():
+        tf.close()
+    open_archives.clear()
+    archive_members.clear()
+    archive_members_bytes = 0
+
+def open_file(path):
+    """ opens a plain file or a member of an archive, e.g. archive.tar.xz/dir/file, for binary reading"""
+    archive, member = split_archive_path(path)
+    if member is None:
+        return open(path, "rb")
+    return open_member(archive, member)
+
+def list_files(folder_name):
+    """ returns the files directly in folder_name or all files if folder_name is an archive"""
+    if is_archive(folder_name):
+        return list(archive_index(folder_name))
+    _,_,fs = next(os.walk(folder_name))
+    return fs
+
+def walk_files(folder_name):
+    """ returns the paths of all files below folder_name including the members of archives"""
+    paths = []
+    for p in [pathlib.Path(folder_name)] + sorted(pathlib.Path(folder_name).rglob("*")):
+        if not p.is_file():
+            continue
+        if is_archive(str(p)):
+            paths += [os.path.join(str(p), member) for member in archive_index(str(p))]
+        else:
+            paths.append(str(p))
+    return paths
+
+# strings that pd.read_excel interprets as missing values by default
+na_strings = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+}
+
+def is_used_label(label, fields):
+    """ checks if a row label matches one of the fields, either exactly or like the fuzzy search of find_row"""
+    label = str(label)
+    return any(label == field or field[0:12] in label for field in fields)
+
+def to_cell(v):
+    """ converts a raw openpyxl cell value the same way pd.read_excel does"""
+    if v is None:
+        return float("nan")
+    if isinstance(v, str) and v in na_strings:
+        return float("nan")
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v
+
+def read_sheet(ws, max_col=None, fields=None):
+    """ reads a worksheet into a dataframe with the layout of pd.read_excel
+
+    Only the first max_col columns are read. If fields is given, the values
+    of rows whose label does not match any of the fields are dropped and
+    only the label column is kept for these rows.
+    """
+    rows = []
+    # some sheets are formatted down to the last excel row, empty rows are
+    # only added once a non-empty row follows, since pd.read_excel drops
+    # trailing empty rows
+    num_empty = 0
+    # the first row serves as header, row labels are in the second column
+    for row in ws.iter_rows(min_row=2, max_col=max_col, values_only=True):
+        label = row[1] if len(row) > 1 else None
+        if fields is not None and (label is None or not is_used_label(label, fields)):
+            row = (None, label) if label is not None else ()
+        if label is None and all(v is None for v in row):
+            num_empty += 1
+            continue
+        rows.extend([] for _ in range(num_empty))
+        num_empty = 0
+        rows.append(row)
+    num_cols = max((len(row) for row in rows), default=0)
+    data = [[to_cell(v) for v in row] + [float("nan")]*(num_cols - len(row)) for row in rows]
+    return pd.DataFrame(data, columns=[f"Unnamed: {i}" for i in range(num_cols)], dtype=object)
+
+def read_workbook(file_name, sheets=("META Data", "Simulations", "Aero Forces")):
+    """ opens a submission once and reads the cells used by the parser
+
+    Returns a dict of dataframes for the requested sheets, which can be passed
+    to serialize and serialize_forces in place of the pd.read_excel output.
+    Cells that are never read by the parser are skipped. The workbook can
+    also be a member of an archive, see open_file.
+    """
+    with open_file(file_name) as f:
+        return read_workbook_file(f, sheets, os.path.basename(file_name))
+
+def read_workbook_file(f, sheets, file_name=""):
+    """ reads the sheets of an opened workbook, see read_workbook"""
+    import openpyxl
+    with profile("open", file_name):
+        wb = openpyxl.load_workbook(f, read_only=True, data_only=True, keep_links=False)
     try:
-        return float(s)
-    except:
-        print(f"{fn}: failed to convert {s} {what} to tdp")
-        ss = str(s)
-        ss=ss.replace("-", "0")
-        ss=ss.replace("W", "")
-        return to_float(fn, what, ss)
+        dfs = {}
+        if "META Data" in sheets:
+            # values are in column 3
+            with profile("decode", file_name, Sheet="META Data"):
+                dfs["META Data"] = read_sheet(wb["META Data"], max_col=4)
+        if "Simulations" in sheets:
+            with profile("decode", file_name, Sheet="Simulations"):
+                dfs["Simulations"] = read_sheet(wb["Simulations"], fields=sim_fields)
+        if "Aero Forces" in sheets:
+            # force histories are in columns 9-13 and means/errors in rows 29-31 columns 3-5
+            with profile("decode", file_name, Sheet="Aero Forces"):
+                dfs["Aero Forces"] = read_sheet(wb["Aero Forces"], max_col=14)
+        return dfs
+    finally:
+        wb.close()
 
 def read_row_col(df_in, row, col, filename):
     return df_in.loc[row].values[col]
 
+def read_float(df_in, row, col, filename, what):
+    """ reads a single cell as float, see to_floats"""
+    return to_floats(filename, what, [read_row_col(df_in, row, col, filename)])[0]
 
-def to_kwh(s):
-    return s if s < 1000 else s/3.6e6
+
+def repeat_categorical(value, n):
+    """ returns a categorical with n times value, only a single copy of value is stored"""
+    if pd.isna(value):
+        return pd.Categorical.from_codes(np.full(n, -1, dtype=np.int8), categories=[])
+    return pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=[value])
+
+def concat_frames(dfs):
+    """ concatenates dataframes such that categorical columns stay categorical
+
+    pd.concat falls back to object columns if the categories differ, thus
+    the categories are unified first.
+    """
+    dfs = [df for df in dfs if len(df.columns)]
+    if not dfs:
+        return pd.DataFrame()
+    for col in dfs[0].columns:
+        if not isinstance(dfs[0][col].dtype, pd.CategoricalDtype):
+            continue
+        categories = sorted(set().union(*(df[col].cat.categories for df in dfs)))
+        dfs = [df.assign(**{col: df[col].cat.set_categories(categories)}) for df in dfs]
+    return pd.concat(dfs)
+
+# columns of the serialize output which are the same for all runs of a file
+run_file_columns = [
+    "Contributor Affiliation",
+    "File Name",
+    "Track",
+    "Mesh",
+    "OpenFOAM Flavor",
+    "Contributor ID",
+    "Software Optimization Category",
+]
+
+def to_compact(df, columns=run_file_columns):
+    """ converts the given columns to categoricals
+
+    Keep in mind that seaborn lists all categories of a categorical hue in
+    the legend, even if they are not part of the plotted data.
+    """
+    return df.astype({col: "category" for col in columns if col in df.columns})
 
 def serialize_forces(df_in, df_meta, filename):
+    """ extracts the force history and the per file values of the Meancalc table
+
+    Returns the history with one row per iteration and a table with a single
+    row indexed by Filename, which can be joined onto the history, see
+    join_force_files. Histories with less than 500 iterations are skipped.
+    """
     cid = filename.split("_")[0]
-    track = get_meta(df_meta, "Submission relates to:")
-    affil = get_meta(df_meta, "Affiliation:")
+    meta = extract_meta(LabelIndex(df_meta), df_meta)
+    track = meta["Track"]
+    affil = meta["Contributor Affiliation"]
     iteration = df_in["Unnamed: 9"].dropna().values[2:]
     num_entries = len(iteration)
+    if num_entries < 500:
+        return pd.DataFrame(), pd.DataFrame()
+
     wct = df_in["Unnamed: 10"].dropna().values[1:num_entries+1]
     cd = df_in["Unnamed: 11"].dropna().values[1:num_entries+1]
     cl = df_in["Unnamed: 12"].dropna().values[1:num_entries+1]
     cs = df_in["Unnamed: 13"].dropna().values[1:num_entries+1]
-    iteration = list(map(partial(to_float, filename, "Iteration"), iteration))
-    cd = list(map(partial(to_float, filename, "Cd"), cd))
-    cs = list(map(partial(to_float, filename, "Cs"), cs))
-    cl = list(map(partial(to_float, filename, "Cl"), cl))
-
     affil = affil_map[affil] if affil in affil_map.keys() else affil
-    affils = [affil]*num_entries
-    cid = [cid]*num_entries
-    track = [track]*num_entries
-    fn = [filename] * num_entries
-    if num_entries < 500:
-        return pd.DataFrame()
-
-    cd_mean =   [read_row_col(df_in, 29, 3, filename)] * num_entries
-    cs_mean =   [read_row_col(df_in, 29, 4, filename)] * num_entries
-    cl_mean =   [read_row_col(df_in, 29, 5, filename)] * num_entries
-    cd_error =  [read_row_col(df_in, 30, 3, filename)] * num_entries
-    cs_error =  [read_row_col(df_in, 30, 4, filename)] * num_entries
-    cl_error =  [read_row_col(df_in, 30, 5, filename)] * num_entries
-    two_sigma_cd=  [read_row_col(df_in, 31, 3, filename)] * num_entries
-    two_sigma_cs=  [read_row_col(df_in, 31, 4, filename)] * num_entries
-    std_dev_cl= [read_row_col(df_in, 31, 5, filename)] * num_entries
-    std_dev_cd= [read_row_col(df_in, 31, 3, filename)] * num_entries
-    std_dev_cs= [read_row_col(df_in, 31, 4, filename)] * num_entries
-    std_dev_cl= [read_row_col(df_in, 31, 5, filename)] * num_entries
 
+    # values which are the same for the whole history are stored as
+    # categoricals instead of repeating them for every iteration
     data_dict = {
-            "Contributor Affiliation": affils,
-            "Filename": fn,
-            "Contributor ID": cid,
-            "Track": track,
-            "Run Wall-Clock Time [s]": wct,
-            "Iteration": iteration,
-            "Cd": cd,
-            "Cl": cl,
-            "Cs": cs,
-            "cd_mean"   :    cd_mean   ,
-            "cs_mean"   :    cs_mean   ,
-            "cl_mean"   :    cl_mean   ,
-            "cd_error"  :    cd_error  ,
-            "cs_error"  :    cs_error  ,
-            "cl_error"  :    cl_error  ,
-            "2sigma_cd" :    two_sigma_cd,
-            "2sigma_cs" :    two_sigma_cs,
-            "std_dev_cl":    std_dev_cl,
-            "std_dev_cd":    std_dev_cd,
-            "std_dev_cs":    std_dev_cs,
-            "std_dev_cl":    std_dev_cl,
+            "Contributor Affiliation": repeat_categorical(affil, num_entries),
+            "Filename": repeat_categorical(filename, num_entries),
+            "Contributor ID": repeat_categorical(cid, num_entries),
+            "Track": repeat_categorical(track, num_entries),
+            "Run Wall-Clock Time [s]": to_floats(filename, "Run Wall-Clock Time", wct),
+            "Iteration": to_floats(filename, "Iteration", iteration),
+            "Cd": to_floats(filename, "Cd", cd),
+            "Cl": to_floats(filename, "Cl", cl),
+            "Cs": to_floats(filename, "Cs", cs),
+            }
+    # the Meancalc table has the columns CD, CL, CS
+    file_dict = {
+            "cd_mean"   :    read_float(df_in, 29, 3, filename, "cd_mean"),
+            "cs_mean"   :    read_float(df_in, 29, 5, filename, "cs_mean"),
+            "cl_mean"   :    read_float(df_in, 29, 4, filename, "cl_mean"),
+            "cd_error"  :    read_float(df_in, 30, 3, filename, "cd_error"),
+            "cs_error"  :    read_float(df_in, 30, 5, filename, "cs_error"),
+            "cl_error"  :    read_float(df_in, 30, 4, filename, "cl_error"),
+            "2sigma_cd" :    read_float(df_in, 31, 3, filename, "2sigma_cd"),
+            "2sigma_cs" :    read_float(df_in, 31, 5, filename, "2sigma_cs"),
+            "std_dev_cl":    read_float(df_in, 32, 4, filename, "std_dev_cl"),
+            "std_dev_cd":    read_float(df_in, 32, 3, filename, "std_dev_cd"),
+            "std_dev_cs":    read_float(df_in, 32, 5, filename, "std_dev_cs"),
             }
     try:
-        df_out = pd.DataFrame.from_dict(data=data_dict)
-        return df_out
+        df_out = pd.DataFrame(data_dict, index=pd.RangeIndex(num_entries))
+        df_file = pd.DataFrame(file_dict, index=pd.Index([filename], name="Filename"))
+        return df_out, df_file
     except Exception as e:
         print(f"{filename} cannot generate dataframe for forces: {e}")
+        return None, None
+
+def join_force_files(dff, dff_files):
+    """ joins the per file values of serialize_forces onto the force histories dff"""
+    return dff.join(dff_files, on="Filename")
 
 def serialize(df_in, df_meta, filename):
     """ reads in raw dataframes and extracts the relevant data
@@ -346,36 +959,38 @@ def serialize(df_in, df_meta, filename):
     # filenames are prefixed with contributor ids
     cid = filename.split("_")[0]
     # get the meta data
-    # values are in column 3
-    affil = get_meta(df_meta, "Affiliation:")
-    mesh = get_meta(df_meta, "Selected Mesh")
-    track = get_meta(df_meta, "Submission relates to:")
-    flavour = get_meta(df_meta, "Flavor")
+    meta = extract_meta(LabelIndex(df_meta), df_meta)
+    affil = meta["Contributor Affiliation"]
+    mesh = meta["Mesh"]
+    track = meta["Track"]
+    flavour = meta["OpenFOAM Flavor"]
 
     # from now on the number of average time step  entries serves as a single source of truth
     # every submitted data set should at least t wall clock times
-    ts = get_sim(df_in, "Wall-clock time per timestep/iteration [s]:", 24)
-    ts = list(map(float, ts))
+    sim = extract_sim(LabelIndex(df_in), df_in, filename)
+    ts = sim["Time per Iteration [s]"]
     num_entries = len(ts)
 
-    wct = get_sim(df_in, "Wall-clock time to completion excl. pre-processing [s]:", 3600)
+    wct = sim["Run Wall-Clock Time [s]"]
     is_partial = 0
     if len(wct) != len(ts):
-        print(f"{filename}: number of timestep != number of wall clock time, assuming partial run")
         is_partial = 1
         if len(wct):
-            print(f"{filename}: trying to fill wct, this makes only sense if N/A cases are contiguously to the right at the moment")
+            # this makes only sense if the N/A cases are contiguously to the right at the moment
+            diagnose(filename, "Run Wall-Clock Time [s]", f"{len(wct)} of {len(ts)} values",
+                     "partial run, missing values set to 0")
             for _ in range(len(ts)-len(wct)):
                 wct.append(0)
+        else:
+            diagnose(filename, "Run Wall-Clock Time [s]", None, "partial run, no values")
 
-    wct_pre = get_sim(df_in, "Time for pre-processing [s]:", num_vals=num_entries, default="N/A")
-    nodes = get_sim(df_in, "# of nodes used:", num_vals=num_entries)
-    cores = get_sim(df_in, "# of CPU cores used:", num_vals=num_entries)
-    cpu = get_sim(df_in, "Hardware Spec (CPU):", num_vals=num_entries)
-    cpu_model = list(map(partial(get_cpu_model, filename), cpu))
-    gpu = get_sim(df_in, "Hardware Spec (GPU):", num_vals=num_entries, default="N/A")
-    gpu_number = get_sim(df_in, "# of GPUs used:", num_vals=num_entries, default=0)
-    gpu_model = list(map(partial(get_gpu_model, filename), gpu))
+    wct_pre = sim["Pre-Processing Wall-Clock Time [s]"]
+    nodes = sim["Number of Nodes"]
+    cores = sim["Number of CPU Cores"]
+    with profile("get_cpu_model", filename):
+        cpu_model = list(map(partial(get_cpu_model, filename), sim["CPU Spec"]))
+    gpu_number = sim["Number of GPU Devices"]
+    gpu_model = list(map(partial(get_gpu_model, filename), sim["GPU Spec"]))
     software_type = [get_software_track_type(filename)] * num_entries
 
     fn = [filename] * num_entries
@@ -387,38 +1002,31 @@ def serialize(df_in, df_meta, filename):
     affils = [affil]*num_entries
     meshs = [mesh.lower()]*num_entries
     cells = list(map(get_cells,meshs))
-    tdp = get_sim(df_in, "TDP of system (CPU+Accelerator) [W]:", num_vals=num_entries, default=0.0)
-
-    energy = get_sim(df_in, "Total energy to completion [kW*h or J]:", num_vals=num_entries, has_separator=False)
-    decomp = get_sim(df_in, "Decomposition Method Method:", num_vals=num_entries, default="N/A")
-
-    llc = get_sim(df_in, "Last-level Cache (Last-Level Cache):", num_vals=num_entries, default="N/A")
-    interconnect = get_sim(df_in, "Network Interconnect Interconnect:", num_vals=num_entries, default="N/A")
-    renum = get_sim(df_in, "Renumbering Method Method:", num_vals=num_entries, default="N/A")
-    storage_fs = get_sim(df_in, "Storage File-system:", num_vals=num_entries, default="N/A")
+    tdp = sim["System TDP [W]"]
+    energy = sim["Run Consumed Energy [kWh]"]
+    decomp = sim["Decomposition Method"]
+    llc = sim["Last-Level Cache"]
+    interconnect = sim["Network Interconnect"]
+    renum = sim["Renumbering Method"]
+    storage_fs = sim["Storage File-System"]
 
 
     # NOTE this doesnt do anything at the moment, since
     if not ts:
-        print(f"{filename}: No timesteps found, using wall clock time")
+        diagnose(filename, "Time per Iteration [s]", None, "missing, using Run Wall-Clock Time / 4000")
         ts = [wct[i]/4000 for i in range(len(wct))]
 
     reported_energy = 1
     if len(energy) == 0:
-        print(f"{filename}: No energy data found")
+        diagnose(filename, "Run Consumed Energy [kWh]", None, "not reported, set to 1e-32")
         # energy = [tdp[i]/1000*nodes[i]*wct[i]/3600 for i in range(num_entries)]
         energy = [1e-32 for _ in range(num_entries)]
         reported_energy = 0
 
-    # NOTE some files contain non convertible energy values
-    energy = list(map(partial(to_float, filename, "energy"), energy))
-    # NOTE some energies are in J so values above 1000 are considered to be in J
-    energy = list(map(to_kwh, energy))
     reported_energy = [reported_energy]*num_entries
-    tdp = list(map(partial(to_tdp, filename, "tdp"), tdp))
 
     if (num_entries == 0):
-        print(f"{filename}: failed to process")
+        diagnose(filename, "", None, "no runs found")
 
     data_dict = {
         "Contributor Affiliation": affils,
@@ -450,6 +1058,10 @@ def serialize(df_in, df_meta, filename):
         "Is Energy Reported": reported_energy,
         "Software Optimization Category": software_type
     }
+    # fields added to the sim_table are passed through as they are
+    for column, values in sim.items():
+        if column not in data_dict and column not in raw_columns:
+            data_dict[column] = values
 
     try:
         df_out = pd.DataFrame.from_dict(data=data_dict)
@@ -487,58 +1099,1603 @@ def serialize(df_in, df_meta, filename):
         # "Software Optimization Category": software_type
         )
 
-def read_submissions(folder_name="submissions"):
-    print("last time the data was updated",datetime.datetime.now(), " by ", os.getlogin() )
-    _,_,fs = next(os.walk(folder_name))
-    dfs = pd.DataFrame()
+def read_submission(folder_name, fn, forces=False):
+    """ reads and serializes a single submission file
 
-    for fn in fs:
-        if not fn.endswith("xlsm"):
-            continue
+    Returns the serialize output, the force histories and per file values of
+    serialize_forces if forces is set, everything printed while parsing and
+    the diagnose records. The
+    messages are captured such that they can be reported in file order even
+    if the files are processed in worker processes.
+    """
+    log = io.StringIO()
+    dft = None
+    dff = None
+    dff_file = None
+    with contextlib.redirect_stdout(log), diagnosing() as records:
         try:
-            df_meta = pd.read_excel(os.path.join(folder_name, fn), sheet_name="META Data")
-            df_sim = pd.read_excel(os.path.join(folder_name, fn), sheet_name="Simulations")
-            dft = serialize(df_sim, df_meta, fn)
+            sheets = ("META Data", "Simulations", "Aero Forces") if forces else ("META Data", "Simulations")
+            sheets = read_workbook(os.path.join(folder_name, fn), sheets=sheets)
+            with profile("serialize", os.path.basename(fn)):
+                dft = serialize(sheets["Simulations"], sheets["META Data"], os.path.basename(fn))
         except Exception as e:
+            diagnose(os.path.basename(fn), "", e, "failed serialization, skipped file")
             print(f"failed serialization of {fn} with {e}")
             print(traceback.format_exc())
-        dfs = pd.concat([dfs,dft])
+            return dft, dff, dff_file, log.getvalue(), records
+        if forces:
+            try:
+                with profile("serialize_forces", os.path.basename(fn)):
+                    dff, dff_file = serialize_forces(sheets["Aero Forces"], sheets["META Data"], os.path.basename(fn))
+            except Exception as e:
+                diagnose(os.path.basename(fn), "", e, "failed force serialization, skipped forces")
+                print(f"failed force serialization of {fn} with {e}")
+                print(traceback.format_exc())
+    return dft, dff, dff_file, log.getvalue(), records
+
+def read_submission_profiled(folder_name, fn, forces=False, trace_memory=False):
+    """ calls read_submission in a worker process and returns its result and profile records"""
+    with profiling(trace_memory) as prof:
+        result = read_submission(folder_name, fn, forces)
+    return result, prof.records
+
+# bump whenever the serialized output changes, such that cached results are
+# invalidated
+parser_version = 11
+
+def get_user():
+    """ returns the name of the user, os.getlogin fails without a controlling terminal, e.g. in batch jobs"""
+    try:
+        return getpass.getuser()
+    except Exception:
+        return "unknown"
+
+@functools.lru_cache(maxsize=None)
+def read_file_hash(path, mtime_ns, size):
+    """ returns the sha256 of the content of a file"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def file_hash(path):
+    """ returns the sha256 of a file, the file is hashed once per version"""
+    st = os.stat(path)
+    return read_file_hash(path, st.st_mtime_ns, st.st_size)
+
+def cache_key(folder_name, fn):
+    """ hashes the parser version, hardware catalog, file name and content of a submission
+
+    The catalog is an input of serialize, thus editing it invalidates the
+    cached results.
+    """
+    h = hashlib.sha256(f"{parser_version}:{file_hash(hardware_catalog_file)}:{fn}:".encode())
+    with open_file(os.path.join(folder_name, fn)) as f:
+        for chunk in iter(partial(f.read, 1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def write_cache(cache_dir, key, result):
+    """ stores the result of read_submission under the given key"""
+    cache_file = os.path.join(cache_dir, key + ".pkl")
+    # write to a temporary file first such that aborted runs don't leave
+    # truncated entries
+    with open(cache_file + ".tmp", "wb") as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(cache_file + ".tmp", cache_file)
+
+def read_cache(cache_dir, key):
+    """ returns the cached result of read_submission or None"""
+    cache_file = os.path.join(cache_dir, key + ".pkl")
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        with open(cache_file, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        print(f"ignoring unreadable cache entry {cache_file}: {e}")
+        return None
+
+def evict_cache(cache_dir, keys):
+    """ removes all entries from the cache that are not in keys"""
+    for cache_file in os.listdir(cache_dir):
+        key, ext = os.path.splitext(cache_file)
+        if ext in [".pkl", ".tmp"] and key not in keys:
+            os.remove(os.path.join(cache_dir, cache_file))
+
+def collect_submissions(folder_name="submissions", jobs=1, cache_dir=None, forces=False, compact=False,
+                        diagnostics=False, per_file=False):
+    """ reads all xlsm submissions in folder_name
+
+    Returns the concatenated serialize output and force histories of
+    serialize_forces, the latter are only read if forces is set or a cache
+    is used. The per file columns of the forces are always categoricals,
+    with compact the run_file_columns of the run data are converted too.
+    With per_file the per file values of the forces (means, errors, etc.)
+    follow the histories as a table indexed by Filename, see
+    join_force_files. With diagnostics the diagnose records of all files are
+    returned as last DataFrame, otherwise only their number is printed.
+
+    With jobs > 1 the workbooks are parsed in a pool of jobs worker
+    processes, jobs=None uses all available cores. The result and the order
+    of the printed messages are the same as for the serial path.
+
+    folder_name can also be a (compressed) tar archive, in which case all
+    xlsm members are read without extracting the archive.
+
+    If cache_dir is given, results are stored per file keyed by the file
+    content and parser version and only new or changed files are parsed.
+    Entries of files that were removed or changed are evicted, thus a cache
+    directory should only be used for a single submissions folder.
+    """
+    print("last time the data was updated",datetime.datetime.now(), " by ", get_user() )
+    fs = [fn for fn in list_files(folder_name) if fn.endswith("xlsm")]
+
+    results = [None] * len(fs)
+    if cache_dir:
+        # cached entries always contain the forces such that they can be
+        # served for both kind of requests
+        forces = True
+        pathlib.Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        with profile("cache"):
+            keys = [cache_key(folder_name, fn) for fn in fs]
+            results = [read_cache(cache_dir, key) for key in keys]
+    todo = [i for i, result in enumerate(results) if result is None]
+    if cache_dir:
+        print(f"parsing {len(todo)} new or changed of {len(fs)} submissions")
+
+    if jobs is None:
+        jobs = os.cpu_count()
+    args = ([folder_name]*len(todo), [fs[i] for i in todo], [forces]*len(todo))
+    if jobs > 1 and len(todo) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(todo))) as pool:
+            if profiler is None:
+                parsed = list(pool.map(read_submission, *args))
+            else:
+                # the records of the workers are returned with the results
+                profiled_results = pool.map(read_submission_profiled, *args, [profiler.trace_memory]*len(todo))
+                parsed = []
+                for result, records in profiled_results:
+                    for record in records:
+                        profiler.add(record)
+                    parsed.append(result)
+    else:
+        parsed = map(read_submission, *args)
+
+    for i, result in zip(todo, parsed):
+        if cache_dir:
+            write_cache(cache_dir, keys[i], result)
+        results[i] = result
+    close_archives()
+
+    dfts = []
+    dffs = []
+    dff_files = []
+    records = []
+    for dft, dff, dff_file, log, file_records in results:
+        print(log, end="")
+        if dft is not None:
+            dfts.append(dft)
+        if dff is not None:
+            dffs.append(dff)
+        if dff_file is not None and not dff_file.empty:
+            dff_files.append(dff_file)
+        records += file_records
+    if records and not diagnostics:
+        print(f"{len(records)} values of {len({r[0] for r in records})} submissions were converted or missing, see read_diagnostics")
 
+    if cache_dir:
+        evict_cache(cache_dir, set(keys))
+
+    with profile("concat"):
+        if compact:
+            dfts = [to_compact(dft) for dft in dfts]
+        out = (concat_frames(dfts), concat_frames(dffs))
+        if per_file:
+            out += (pd.concat(dff_files) if dff_files else pd.DataFrame(),)
+        if diagnostics:
+            out += (diagnostics_frame(records),)
+        return out
+
+def read_submissions(folder_name="submissions", jobs=1, cache_dir=None, compact=False):
+    """ reads the run data of all xlsm submissions in folder_name, see collect_submissions"""
+    dfs, _ = collect_submissions(folder_name, jobs, cache_dir, compact=compact)
     return dfs
 
-def derive_metrics(df):
-    df["Total Core Time [s]"] = df["Run Wall-Clock Time [s]"] * df["Number of CPU Cores"]
-    df["Total Node Time [s]"] = df["Run Wall-Clock Time [s]"] * df["Number of Nodes"]
-    #energy per iteration = tdp * dt [Ws]
-    df["Energy per Iteration [J]"] = df["System TDP [W]"] * df["Time per Iteration [s]"]
-    df["Energy per Iteration [kJ]"] = df["Energy per Iteration [J]"] / 1000
+def read_diagnostics(folder_name="submissions", jobs=1, cache_dir=None):
+    """ returns the File, Field, Raw Value and Action of every value that was converted, missing
+    or replaced while reading the submissions in folder_name, see diagnose"""
+    return collect_submissions(folder_name, jobs, cache_dir, diagnostics=True)[2]
 
-    # Total energy is based on the TDP since not all submissions provided (reliable) measurements
-    df["Energy-To-Solution [kWh]"] = df["Energy per Iteration [J]"] * 4/3600
+def read_forces(folder_name="submissions", jobs=1, cache_dir=None, per_file=False):
+    """ reads the aero forces of all xlsm submissions in folder_name, see collect_submissions
 
-    # Total WCT is based on the WCT/iteration since there were partial runs
-    df["Time-To-Solution [h]"] = df["Time per Iteration [s]"] * 4000/3600
-    df["Core-Time-To-Solution [h]"] = df["Time-To-Solution [h]"] * df["Number of CPU Cores"]
-    df["Node-Time-To-Solution [h]"] = df["Time-To-Solution [h]"] * df["Number of Nodes"]
+    The per file values (means, errors, etc.) are joined onto the force
+    histories, with per_file the histories and the table of the per file
+    values indexed by the file name are returned instead, see join_force_files.
+    """
+    _, dfsf, dff_files = collect_submissions(folder_name, jobs, cache_dir, forces=True, per_file=True)
+    if per_file:
+        return dfsf, dff_files
+    return join_force_files(dfsf, dff_files)
+
+# column types of the data store, columns which are not listed here (e.g.
+# the output of derive_metrics) are stored with the type pandas reports
+run_dtypes = {
+    "Contributor Affiliation": "category",
+    "File Name": "category",
+    "Run Wall-Clock Time [s]": "float64",
+    "Pre-Processing Wall-Clock Time [s]": "float64",
+    "Storage File-System": "category",
+    "Number of CPU Cores": "Int64",
+    "Number of GPU Devices": "Int64",
+    "Number of Nodes": "Int64",
+    "CPU Family": "category",
+    "CPU Model": "category",
+    "CPU Submodel": "category",
+    "CPU Generation": "category",
+    "GPU Model": "category",
+    "Mesh": "category",
+    "System TDP [W]": "float64",
+    "Number of Cells": "float64",
+    "Time per Iteration [s]": "float64",
+    "Track": "category",
+    "OpenFOAM Flavor": "category",
+    "Run Consumed Energy [kWh]": "float64",
+    "Decomposition Method": "category",
+    "Last-Level Cache": "category",
+    "Network Interconnect": "category",
+    "Renumbering Method": "category",
+    "Contributor ID": "category",
+    "Is Partial": "Int8",
+    "Is Energy Reported": "Int8",
+    "Software Optimization Category": "category",
+}
+
+forces_dtypes = {
+    "Contributor Affiliation": "category",
+    "Filename": "category",
+    "Contributor ID": "category",
+    "Track": "category",
+    "Run Wall-Clock Time [s]": "float64",
+    "Iteration": "float64",
+    "Cd": "float64",
+    "Cl": "float64",
+    "Cs": "float64",
+}
+
+force_files_dtypes = {
+    "Filename": "category",
+    "cd_mean": "float64",
+    "cs_mean": "float64",
+    "cl_mean": "float64",
+    "cd_error": "float64",
+    "cs_error": "float64",
+    "cl_error": "float64",
+    "2sigma_cd": "float64",
+    "2sigma_cs": "float64",
+    "std_dev_cl": "float64",
+    "std_dev_cd": "float64",
+    "std_dev_cs": "float64",
+}
+
+def to_schema(df, dtypes, name=""):
+    """ converts the columns of df to the given dtypes
 
+    Non numeric entries of numeric columns (e.g. N/A) become missing values
+    and are recorded with the file of their row, see diagnose, categories are
+    stored as strings. Numeric columns which already have their dtype are
+    kept, thus converted frames are passed through. A named index, e.g. the
+    Filename of the per file values, becomes a column.
+    """
+    df = df.reset_index(drop=df.index.name is None)
+    files = next((df[col].astype(str) for col in ["File Name", "Filename"] if col in df), None)
+    out = {}
+    for col in df.columns:
+        dtype = dtypes.get(col)
+        if dtype is None or (dtype != "category" and df[col].dtype == dtype):
+            out[col] = df[col]
+        elif dtype == "category":
+            out[col] = df[col].astype("string").astype("category")
+        else:
+            values = pd.to_numeric(df[col], errors="coerce")
+            for i in np.flatnonzero(values.isna() & df[col].notna()):
+                diagnose(name if files is None else files[i], col, df[col].iloc[i], f"not a number, stored as missing in {name}")
+            out[col] = values.astype(dtype)
+    return pd.DataFrame(out)
+
+def write_table(df, file_name):
+    """ writes df as uncompressed Arrow IPC file which can be memory mapped"""
+    import pyarrow as pa
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.ipc.new_file(file_name, table.schema) as writer:
+        writer.write_table(table)
+
+def export_store(dfs, dfsf=None, path="data_store", dff_files=None):
+    """ writes the run table and optionally the forces to a typed columnar store
+
+    The tables are written as runs.arrow, forces.arrow and force_files.arrow
+    (the per file values of the forces, see collect_submissions) in path
+    using the types of run_dtypes, forces_dtypes and force_files_dtypes, see
+    load_store.
+    """
+    pathlib.Path(path).mkdir(parents=True, exist_ok=True)
+    write_table(to_schema(dfs, run_dtypes, "runs"), os.path.join(path, "runs.arrow"))
+    if dfsf is not None:
+        write_table(to_schema(dfsf, forces_dtypes, "forces"), os.path.join(path, "forces.arrow"))
+    if dff_files is not None:
+        write_table(to_schema(dff_files, force_files_dtypes, "force_files"), os.path.join(path, "force_files.arrow"))
+
+def load_store(path="data_store", table="runs", columns=None, filters=None):
+    """ loads a table of the data store written by export_store
+
+    The file is memory mapped and only the requested columns and the rows
+    matching filters are read. Filters are given like for pd.read_parquet,
+    e.g. [("Mesh", "==", "fine"), ("Number of Nodes", ">", 1)].
+    """
+    import pyarrow.dataset
+    import pyarrow.fs
+    import pyarrow.parquet
+    dataset = pyarrow.dataset.dataset(
+        os.path.join(path, table + ".arrow"), format="ipc",
+        filesystem=pyarrow.fs.LocalFileSystem(use_mmap=True))
+    expression = pyarrow.parquet.filters_to_expression(filters) if filters else None
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+# indexed columns of the tables of the sql store, see export_sql
+sql_indexes = {
+    "runs": ["Mesh", "Track", "CPU Family", "Contributor ID", "File Name"],
+    "forces": ["Filename", "Contributor ID", "Track"],
+    "force_files": ["Filename"],
+    "diagnostics": ["File", "Field"],
+}
+
+def sql_name(name):
+    """ quotes a table or column name for sqlite"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+def sql_where(where, table=""):
+    """ returns the condition and parameters of a dict of column values
+
+    A list matches any of its values, e.g. {"Mesh": ["coarse", "fine"]}.
+    """
+    prefix = sql_name(table) + "." if table else ""
+    conditions = []
+    params = []
+    for col, value in (where or {}).items():
+        values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+        conditions.append(f"{prefix}{sql_name(col)} IN ({', '.join('?' * len(values))})")
+        params += values
+    return " AND ".join(conditions) or "1", params
+
+def export_sql(dfs, dfsf=None, path="data_store/ohc.sqlite", diagnostics=None, dff_files=None):
+    """ writes the run table and optionally the forces and diagnostics to a sqlite database
+
+    The tables runs, forces and force_files are typed like the data store,
+    see export_store, and replaced if they exist, as is the diagnostics
+    table, see read_diagnostics. The columns of sql_indexes
+    are indexed, see query_store and select_store.
+    """
+    pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tables = {"runs": to_schema(dfs, run_dtypes, "runs")}
+    if dfsf is not None:
+        tables["forces"] = to_schema(dfsf, forces_dtypes, "forces")
+    if dff_files is not None:
+        tables["force_files"] = to_schema(dff_files, force_files_dtypes, "force_files")
+    if diagnostics is not None:
+        tables["diagnostics"] = diagnostics
+    with contextlib.closing(sqlite3.connect(path)) as con, con:
+        for table, df in tables.items():
+            df.to_sql(table, con, if_exists="replace", index=False, chunksize=50000)
+            for col in sql_indexes[table]:
+                if col in df.columns:
+                    index = sql_name(f"{table}_{col.replace(' ', '_')}")
+                    con.execute(f"CREATE INDEX {index} ON {sql_name(table)} ({sql_name(col)})")
+
+def query_store(sql, params=(), path="data_store/ohc.sqlite"):
+    """ returns the result of the sql query on the store written by export_sql as a DataFrame
+
+    Example: op.query_store('SELECT Mesh, MIN("Time per Iteration [s]") FROM runs GROUP BY Mesh')
+    """
+    with contextlib.closing(sqlite3.connect(path)) as con:
+        return pd.read_sql_query(sql, con, params=params)
+
+def select_store(table="runs", where=None, columns=None, path="data_store/ohc.sqlite"):
+    """ returns the rows of table matching the column values of where, see sql_where
+
+    The forces can be selected by the columns of the runs too, e.g.
+    select_store("forces", {"Mesh": "fine", "CPU Family": "AMD"}) returns
+    the force histories of all runs on the fine mesh and AMD CPUs.
+    """
+    with contextlib.closing(sqlite3.connect(path)) as con:
+        table_columns = [row[1] for row in con.execute(f"PRAGMA table_info({sql_name(table)})")]
+        own = {col: value for col, value in (where or {}).items() if col in table_columns}
+        condition, params = sql_where(own)
+        if table == "forces" and len(own) < len(where or {}):
+            runs = {col: value for col, value in where.items() if col not in own}
+            run_condition, run_params = sql_where(runs)
+            condition += f' AND "Filename" IN (SELECT "File Name" FROM runs WHERE {run_condition})'
+            params += run_params
+        selected = ", ".join(map(sql_name, columns)) if columns else "*"
+        return pd.read_sql_query(f"SELECT {selected} FROM {sql_name(table)} WHERE {condition}", con, params=params)
+
+# lines of OpenFOAM solver logs which are extracted by parse_solver_log
+solver_log_re = re.compile(
+    rb"^(?:Time = (?P<time>\S+)"
+    rb"|\w+:\s+Solving for (?P<field>\w+), Initial residual = (?P<initial>[^,]+), "
+    rb"Final residual = (?P<final>[^,]+), No Iterations (?P<iters>\d+)"
+    rb"|ExecutionTime = (?P<execution>\S+) s\s+ClockTime = (?P<clock>\S+) s)",
+    re.M)
+
+def parse_solver_log(file_name):
+    """ parses an OpenFOAM solver log in a single pass over the memory mapped file
+
+    Returns a frame with one row per Time block containing the ExecutionTime,
+    ClockTime and for every solved field the initial residual of the first
+    solve, the final residual of the last solve and the total number of linear
+    solver iterations. Solves before the first Time block (e.g. potentialFoam)
+    are returned as a row without Time. Logs inside archives are read in
+    memory, see open_file.
+    """
+    return parse_log(file_name, parse_solver_output)
+
+def parse_log(file_name, parse, empty=pd.DataFrame):
+    """ calls parse with the memory mapped content of the log file_name
+
+    Logs inside archives are read in memory, see open_file. For empty files
+    empty() is returned since they can not be memory mapped.
+    """
+    if split_archive_path(file_name)[1] is not None:
+        with open_file(file_name) as f:
+            return parse(f.read())
+    if os.path.getsize(file_name) == 0:
+        return empty()
+    with open(file_name, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return parse(mm)
+
+def parse_solver_output(buffer):
+    """ parses the solver output contained in a bytes like buffer, see parse_solver_log"""
+    rows = []
+    row = {}
+    for m in solver_log_re.finditer(buffer):
+        time, field = m.group("time", "field")
+        if time is not None:
+            if row:
+                rows.append(row)
+            row = {"Time": float(time)}
+        elif field is not None:
+            field = field.decode()
+            if f"{field} Initial Residual" not in row:
+                row[f"{field} Initial Residual"] = float(m["initial"])
+                row[f"{field} Iterations"] = 0
+            row[f"{field} Final Residual"] = float(m["final"])
+            row[f"{field} Iterations"] += int(m["iters"])
+        else:
+            row["ExecutionTime [s]"] = float(m["execution"])
+            row["ClockTime [s]"] = float(m["clock"])
+    if row:
+        rows.append(row)
+    return pd.DataFrame.from_records(rows)
+
+def join_restarts(dfs):
+    """ joins the parsed logs of a run that was restarted, in the order of the restarts
+
+    Time blocks of a log that are repeated by the following log are dropped,
+    e.g. a run that crashed at Time = 2587 and was restarted from Time = 2000.
+    The Accumulated ClockTime [s] continues the clock time over the restarts.
+    """
+    dfs = [df for df in dfs if not df.empty]
+    out = []
+    offset = 0.0
+    for i, df in enumerate(dfs):
+        if i + 1 < len(dfs) and "Time" in df.columns and "Time" in dfs[i+1].columns:
+            df = df[~(df["Time"] >= dfs[i+1]["Time"].min())]
+        df = df.assign(**{"Segment": i})
+        if "ClockTime [s]" in df.columns:
+            df["Accumulated ClockTime [s]"] = df["ClockTime [s]"] + offset
+            offset = df["Accumulated ClockTime [s]"].max()
+        out.append(df)
+    if not out:
+        return pd.DataFrame()
+    return pd.concat(out, ignore_index=True)
+
+def find_solver_logs(folder_name="submissions/logs,inputs,etc"):
+    """ returns all OpenFOAM application logs (*Foam*.log) below folder_name including those in archives"""
+    return sorted(p for p in walk_files(folder_name) if fnmatch.fnmatch(os.path.basename(p), "*Foam*.log"))
+
+def get_application(file_name):
+    """ returns the OpenFOAM application a log belongs to based on its name"""
+    match = re.search(r"[A-Za-z]+Foam", os.path.basename(file_name))
+    return match.group() if match else "Unknown"
+
+def read_solver_logs(file_names=None, jobs=1):
+    """ parses many solver logs into a single per iteration frame
+
+    Logs of the same application in the same directory are joined in the
+    order of their file names, which contain a time stamp, if they are
+    restarts, i.e. start at a later Time than the previous log, see
+    join_restarts. Otherwise they are considered separate runs, the Run
+    column holds the name of the first log of a run. The logs are parsed in a
+    pool of jobs worker processes, jobs=None uses all available cores.
+    """
+    if file_names is None:
+        file_names = find_solver_logs()
+    file_names = sorted(file_names)
+    if jobs is None:
+        jobs = os.cpu_count()
+    if jobs > 1 and len(file_names) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(file_names))) as pool:
+            parsed = list(pool.map(parse_solver_log, file_names))
+    else:
+        parsed = list(map(parse_solver_log, file_names))
+
+    runs = {}
+    last_run = {}
+    last_first_time = {}
+    for file_name, df in zip(file_names, parsed):
+        case = (os.path.dirname(file_name), get_application(file_name))
+        first_time = df["Time"].min() if "Time" in df.columns else float("nan")
+        # a log which does not start later than the previous one is a new run
+        if case not in last_run or not first_time > last_first_time[case]:
+            last_run[case] = case + (os.path.basename(file_name),)
+            runs[last_run[case]] = []
+        last_first_time[case] = first_time
+        runs[last_run[case]].append(df.assign(Log=os.path.basename(file_name)))
+
+    dfs = []
+    for (case, application, run_name), run in runs.items():
+        df = join_restarts(run)
+        if df.empty:
+            continue
+        df.insert(0, "Run", repeat_categorical(run_name, len(df)))
+        df.insert(0, "Application", repeat_categorical(application, len(df)))
+        df.insert(0, "Case", repeat_categorical(case, len(df)))
+        df["Log"] = df["Log"].astype("category")
+        dfs.append(df)
+    return concat_frames(dfs).reset_index(drop=True)
+
+# lines of decomposePar logs which are extracted by parse_decompose_log
+decompose_log_re = re.compile(
+    rb"^(?:Processor (?P<processor>\d+)[ \t]*$"
+    rb"|    Number of (?P<count>cells|points|processor patches|processor faces|boundary faces) = (?P<value>\d+)"
+    rb"|Decomposition method (?P<method>\S+) \[(?P<domains>\d+)\]"
+    rb"|Finished decomposition in (?P<decompose>\S+) s"
+    rb"|ExecutionTime = (?P<execution>\S+) s\s+ClockTime = (?P<clock>\S+) s)",
+    re.M)
+
+# lines of renumberMesh logs which are extracted by parse_renumber_log
+renumber_log_re = re.compile(
+    rb"^(?:nProcs\s*: (?P<domains>\d+)"
+    rb"|    \((?P<host>\S+) \d+\)"
+    rb"|Mesh (?:\w+ )?size: (?P<cells>\d+)"
+    rb"|(?P<stage>Before|After) renumbering"
+    rb"|    (?P<measure>band|profile)\s*: (?P<value>\d+)"
+    rb"|Using renumber-method: (?P<method>\S+)"
+    rb"|    (?P<timing>read mesh|read fields|decompose|cell-cells|renumber|write)\s*: (?P<seconds>\S+)"
+    rb"|ExecutionTime = (?P<execution>\S+) s\s+ClockTime = (?P<clock>\S+) s)",
+    re.M)
+
+def parse_decompose_log(file_name):
+    """ parses a decomposePar log into its summary and a per processor frame
+
+    Returns a dict with the Decomposition Method, the number of subdomains and
+    the time of the decomposition stage and a frame with one row per
+    processor containing its number of cells, points, processor patches,
+    processor faces and (non processor) boundary faces.
+    """
+    return parse_log(file_name, parse_decompose_output, lambda: ({}, pd.DataFrame()))
+
+def parse_decompose_output(buffer):
+    """ parses the decomposePar output contained in a bytes like buffer, see parse_decompose_log"""
+    info = {}
+    rows = []
+    for m in decompose_log_re.finditer(buffer):
+        if m["processor"] is not None:
+            rows.append({"Processor": int(m["processor"])})
+        elif m["count"] is not None:
+            if rows:
+                rows[-1][f"Number of {m['count'].decode().title()}"] = int(m["value"])
+        elif m["method"] is not None:
+            info["Decomposition Method"] = m["method"].decode()
+            info["Number of Subdomains"] = int(m["domains"])
+        elif m["decompose"] is not None:
+            info["Decomposition Time [s]"] = float(m["decompose"])
+        else:
+            info["decomposePar ExecutionTime [s]"] = float(m["execution"])
+            info["decomposePar ClockTime [s]"] = float(m["clock"])
+    return info, pd.DataFrame.from_records(rows)
+
+def parse_renumber_log(file_name):
+    """ parses a renumberMesh log into a dict
+
+    Contains the number of subdomains, hosts and cells, the renumber method, the
+    bandwidth and profile before and after renumbering and the timings of
+    the stages as reported by renumberMesh.
+    """
+    return parse_log(file_name, parse_renumber_output, dict)
+
+def parse_renumber_output(buffer):
+    """ parses the renumberMesh output contained in a bytes like buffer, see parse_renumber_log"""
+    info = {}
+    stage = "Before"
+    for m in renumber_log_re.finditer(buffer):
+        if m["domains"] is not None:
+            info["Number of Subdomains"] = int(m["domains"])
+        elif m["host"] is not None:
+            info["Number of Hosts"] = info.get("Number of Hosts", 0) + 1
+        elif m["cells"] is not None:
+            info["Number of Mesh Cells"] = int(m["cells"])
+        elif m["stage"] is not None:
+            stage = m["stage"].decode()
+        elif m["measure"] is not None:
+            info[f"{m['measure'].decode().title()} {stage} Renumbering"] = int(m["value"])
+        elif m["method"] is not None:
+            info["Renumber Method"] = m["method"].decode()
+        elif m["timing"] is not None:
+            info[f"renumberMesh {m['timing'].decode()} [s]"] = float(m["seconds"])
+        else:
+            info["renumberMesh ExecutionTime [s]"] = float(m["execution"])
+            info["renumberMesh ClockTime [s]"] = float(m["clock"])
+    return info
+
+def summarize_decomposition(df):
+    """ returns the load balance of a per processor frame of parse_decompose_log
+
+    The imbalance is the ratio of the maximum to the mean over the processors,
+    the Processor Face Fraction is the share of processor faces of all
+    boundary faces of the subdomains.
+    """
+    if df.empty:
+        return {}
+    info = {"Number of Mesh Cells": df["Number of Cells"].sum()}
+    for count in ["Cells", "Processor Faces", "Processor Patches"]:
+        values = df[f"Number of {count}"]
+        info[f"Max {count}"] = values.max()
+        info[f"Mean {count}"] = values.mean()
+        info[f"{count} Imbalance"] = values.max() / values.mean() if values.mean() else float("nan")
+    proc_faces = df["Number of Processor Faces"].sum()
+    info["Processor Face Fraction"] = proc_faces / (proc_faces + df["Number of Boundary Faces"].sum())
+    info["Processor Faces per Cell"] = proc_faces / df["Number of Cells"].sum()
+    return info
+
+def find_preprocessing_logs(folder_name="submissions/logs,inputs,etc"):
+    """ returns all decomposePar and renumberMesh logs below folder_name including those in archives"""
+    return sorted(p for p in walk_files(folder_name)
+                  if fnmatch.fnmatch(os.path.basename(p), "*decomposePar*.log")
+                  or fnmatch.fnmatch(os.path.basename(p), "*renumberMesh*.log"))
+
+def get_contributor_id(file_name, folder_name):
+    """ returns the contributor id of a log from its folder below folder_name, e.g. 05-Huawei -> 05"""
+    top = pathlib.PurePath(os.path.relpath(file_name, folder_name)).parts[0]
+    match = re.match(r"\d+", top)
+    return match.group() if match else top
+
+def parse_preprocessing_log(file_name):
+    """ dispatches to parse_decompose_log or parse_renumber_log based on the file name"""
+    if "decomposePar" in os.path.basename(file_name):
+        return parse_decompose_log(file_name)
+    return parse_renumber_log(file_name), pd.DataFrame()
+
+def read_preprocessing_logs(folder_name="submissions/logs,inputs,etc", jobs=1, per_processor=False):
+    """ parses the decomposePar and renumberMesh logs into one row per case directory
+
+    Returns the summary of parse_decompose_log and parse_renumber_log with the
+    load balance of summarize_decomposition, the Contributor ID and the Case
+    directory. If per_processor is set also the per processor frames of all
+    cases are returned. The logs are parsed in a pool of jobs worker
+    processes, jobs=None uses all available cores.
+    """
+    file_names = find_preprocessing_logs(folder_name)
+    if jobs is None:
+        jobs = os.cpu_count()
+    if jobs > 1 and len(file_names) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(file_names))) as pool:
+            parsed = list(pool.map(parse_preprocessing_log, file_names))
+    else:
+        parsed = list(map(parse_preprocessing_log, file_names))
+
+    cases = {}
+    processors = []
+    for file_name, (info, df) in zip(file_names, parsed):
+        case = os.path.dirname(file_name)
+        row = cases.setdefault(case, {
+            "Contributor ID": get_contributor_id(file_name, folder_name),
+            "Case": case})
+        # the number of cells of the renumberMesh log is preferred over the sum of the subdomains
+        row.update({k: v for k, v in summarize_decomposition(df).items() if k not in row})
+        row.update(info)
+        if per_processor and not df.empty:
+            df.insert(0, "Case", repeat_categorical(case, len(df)))
+            processors.append(df)
+
+    df = pd.DataFrame.from_records(list(cases.values()))
+    if not df.empty:
+        df["Mesh"] = df["Number of Mesh Cells"].map(get_mesh)
+    if per_processor:
+        return df, concat_frames(processors).reset_index(drop=True)
+    return df
+
+def get_mesh(cells, tolerance=0.1):
+    """ returns the name of the mesh with approximately the given number of cells, see get_cells"""
+    for mesh in ["coarse", "medium", "fine"]:
+        if abs(cells - get_cells(mesh)) <= tolerance * get_cells(mesh):
+            return mesh
+    return "unknown"
+
+def join_preprocessing(dfs, dfp):
+    """ joins the summary of read_preprocessing_logs onto the run table dfs
+
+    The run table does not record the case directory, hence a case is matched
+    to the runs of the same contributor on the same mesh with the same number
+    of CPU cores as subdomains and, if the logs report it, the same Number of
+    Nodes as Number of Hosts. Keys matching several cases are ambiguous and,
+    like runs without logs, get missing values.
+    """
+    keys = ["Contributor ID", "Mesh", "Number of CPU Cores"]
+    dfp = dfp.rename(columns={"Number of Subdomains": "Number of CPU Cores"}).dropna(subset=keys)
+    dfp = dfp.astype({"Contributor ID": str, "Mesh": str, "Number of CPU Cores": "int64"})
+    left = dfs[keys].astype({"Contributor ID": str, "Mesh": str}).assign(**{
+        "Number of CPU Cores": pd.to_numeric(dfs["Number of CPU Cores"], errors="coerce"),
+        "Number of Nodes": pd.to_numeric(dfs["Number of Nodes"], errors="coerce")})
+    hosts = dfp["Number of Hosts"] if "Number of Hosts" in dfp else pd.Series(np.nan, index=dfp.index)
+    joined = []
+    for on, cases in [(keys + ["Number of Nodes"], dfp[hosts.notna()].assign(**{"Number of Nodes": hosts})),
+                      (keys, dfp[hosts.isna()])]:
+        cases = cases[~cases.duplicated(subset=on, keep=False)]
+        joined.append(left.merge(cases, on=on, how="left", validate="many_to_one", indicator=True).drop(
+            columns=keys + ["Number of Nodes"]).set_axis(dfs.index))
+    # runs with a case of the same number of hosts, else one without hosts
+    with_hosts = joined[0].pop("_merge") == "both"
+    joined = joined[0].where(with_hosts, joined[1].drop(columns="_merge"), axis=0)
+    return pd.concat([dfs, joined], axis=1)
+
+def find_clock_files(folder_name="submissions/logs,inputs,etc"):
+    """ returns all clockTime_0 files written by foamLog below folder_name including those in archives"""
+    return sorted(p for p in walk_files(folder_name) if os.path.basename(p) == "clockTime_0")
+
+def read_clock_file(file_name):
+    """ reads the accumulated clock time per iteration of a foamLog clockTime_0 file"""
+    with open_file(file_name) as f:
+        clock = np.loadtxt(f, ndmin=2)[:, -1]
+    return pd.DataFrame({"Iteration": np.arange(1, len(clock) + 1, dtype=float), "Clock Time [s]": clock})
+
+def read_iteration_times(folder_name="submissions/logs,inputs,etc", jobs=1):
+    """ returns the accumulated clock time per iteration of all runs with per iteration timings
+
+    Runs are taken from the solver logs, see read_solver_logs, or from the
+    clockTime_0 files of foamLog for cases without solver logs. Timings below
+    a case directory with timings, e.g. of the parts of a restarted run, are
+    skipped. Returns the Case, Run, Segment (restarts), Iteration and Clock
+    Time [s] of every iteration.
+    """
+    dfl = read_solver_logs(find_solver_logs(folder_name), jobs)
+    dfs = []
+    if not dfl.empty and "Time" in dfl.columns:
+        dfl = dfl.dropna(subset=["Time", "Accumulated ClockTime [s]"])
+        dfs.append(pd.DataFrame({
+            "Case": dfl["Case"].astype(str), "Run": dfl["Run"].astype(str), "Segment": dfl["Segment"],
+            "Iteration": dfl["Time"], "Clock Time [s]": dfl["Accumulated ClockTime [s]"]}))
+    cases = set(dfs[0]["Case"]) if dfs else set()
+    for file_name in find_clock_files(folder_name):
+        case = os.path.dirname(file_name)
+        if any(case == c or case.startswith(c + os.sep) for c in cases):
+            continue
+        cases.add(case)
+        df = read_clock_file(file_name)
+        dfs.append(df.assign(Case=case, Run=os.path.basename(file_name), Segment=0))
+    columns = ["Case", "Run", "Segment", "Iteration", "Clock Time [s]"]
+    if not dfs:
+        return pd.DataFrame(columns=columns)
+    df = pd.concat(dfs, ignore_index=True)[columns]
+    return df.astype({"Case": "category", "Run": "category"})
+
+def split_iteration_times(clock, segment, threshold=5.0, block=50, neighbours=5):
+    """ separates the steady-state iteration time of a run from startup, restarts and write spikes
+
+    clock is the accumulated clock time per iteration and segment the
+    restart segment of every iteration. The baseline time per iteration is
+    the median of the mean times of the neighbouring blocks of iterations,
+    thus it follows slow changes, e.g. cheaper iterations of a converging
+    run. Iterations exceeding it by more than threshold robust standard
+    deviations (at least 1.5 clock ticks, the clock times of OpenFOAM are
+    whole seconds) are outliers. Leading outliers are the startup, outliers
+    at the start of a segment restarts and other consecutive outliers are a
+    single write. Returns a dict of the results and the write mask. Runs
+    with less than 2 iterations can't be split, their results are missing.
+    """
+    n = len(clock)
+    if n < 2:
+        info = dict.fromkeys([
+            "Steady-State Time per Iteration [s]", "Startup Iterations", "Startup Time [s]", "Restart Time [s]",
+            "Number of Writes", "Write Time [s]", "Write Cost [s]", "Write Interval [iter]",
+            "I/O Overhead Fraction"], np.nan)
+        return {"Number of Iterations": n, "Total Clock Time [s]": clock[-1] if n else np.nan, **info}, \
+            np.zeros(n, dtype=bool)
+    times = np.diff(clock, prepend=0.0)
+    starts = np.flatnonzero(np.diff(segment, prepend=segment[0] - 1) != 0)
+
+    # mean times of the blocks, the first one starts after the first iteration
+    edges = np.r_[np.arange(0, n - 1, block), n - 1]
+    block_times = np.diff(clock[edges]) / np.diff(edges)
+    window = np.lib.stride_tricks.sliding_window_view(
+        np.pad(block_times, neighbours // 2, mode="edge"), neighbours)
+    baseline = np.repeat(np.median(window, axis=1), np.diff(edges))
+    baseline = np.r_[baseline[0], baseline]
+
+    excess = times - baseline
+    ticks = np.diff(np.unique(clock))
+    tick = ticks[ticks > 0].min() if (ticks > 0).any() else 0.0
+    sigma = 1.4826 * np.median(np.abs(excess - np.median(excess)))
+    outliers = excess > max(threshold * sigma, 1.5 * tick)
+    outliers[0] = True
+
+    startup = int(np.argmin(outliers)) if not outliers.all() else n
+    restarts = starts[starts > 0]
+    writes = outliers.copy()
+    writes[:startup] = False
+    writes[restarts] = False
+    steady = times[~outliers].mean() if not outliers.all() else np.nan
+
+    events = np.flatnonzero(writes & ~np.r_[False, writes[:-1]])
+    write_time = excess[writes].sum()
+    return {
+        "Number of Iterations": n,
+        "Total Clock Time [s]": clock[-1],
+        "Steady-State Time per Iteration [s]": steady,
+        "Startup Iterations": startup,
+        "Startup Time [s]": excess[:startup].sum(),
+        "Restart Time [s]": excess[restarts].sum(),
+        "Number of Writes": len(events),
+        "Write Time [s]": write_time,
+        "Write Cost [s]": write_time / len(events) if len(events) else np.nan,
+        "Write Interval [iter]": np.median(np.diff(events)) if len(events) > 1 else np.nan,
+        "I/O Overhead Fraction": write_time / clock[-1],
+    }, writes
+
+def io_overhead(dft, threshold=5.0):
+    """ analyses the per iteration timings of read_iteration_times, one row per Case and Run
+
+    Returns the Steady-State Time per Iteration [s] without startup,
+    restarts and writes, the Startup Time [s] (the excess time before the
+    first steady iteration, e.g. reading the mesh) and Restart Time [s], the
+    Number of Writes, their total Write Time [s], the Write Cost [s] per
+    write and the Write Interval [iter] as well as the I/O Overhead Fraction
+    of the writes in the Total Clock Time [s], see split_iteration_times.
+    """
+    rows = []
+    for (case, run), df in dft.groupby(["Case", "Run"], observed=True, sort=False):
+        df = df.sort_values(["Segment", "Iteration"])
+        info, _ = split_iteration_times(df["Clock Time [s]"].to_numpy(dtype=float),
+                                        df["Segment"].to_numpy(), threshold)
+        write_interval = info["Write Interval [iter]"]
+        if not np.isnan(write_interval):
+            # the events are counted in rows, convert them to solver iterations
+            write_interval *= np.median(np.diff(df["Iteration"].to_numpy()))
+        rows.append({"Case": case, "Run": run, **info, "Write Interval [iter]": write_interval})
+    return pd.DataFrame.from_records(rows)
+
+def join_io_overhead(dfs, dfio, dfp):
+    """ joins the io_overhead results onto the run table dfs
+
+    A case is matched to its runs by the summary of read_preprocessing_logs
+    of the same case directory, see join_preprocessing. Cases with several
+    runs are matched by their first run.
+    """
+    dfp = dfp[[c for c in ["Case", "Contributor ID", "Mesh", "Number of Subdomains", "Number of Hosts"] if c in dfp]]
+    dfio = dfp.merge(dfio.drop_duplicates(subset="Case").drop(columns="Run"), on="Case")
+    return join_preprocessing(dfs, dfio.drop(columns="Case"))
+
+def peak_memory_bandwidth(cores, nodes, gpus, family, model, submodel, generation, gpu_model):
+    """ returns the peak memory bandwidth of the used sockets or of all GPU devices of every run
+
+    Memory bandwidth limits the throughput of OpenFOAM, see get_hardware_specs.
+    Without the cores per socket of a CPU one socket per node is assumed.
+    """
+    specs = get_hardware_specs(pd.DataFrame({
+        "CPU Family": family, "CPU Model": model, "CPU Submodel": submodel, "CPU Generation": generation,
+        "GPU Model": gpu_model}))
+    nodes = pd.to_numeric(nodes, errors="coerce")
+    gpus = pd.to_numeric(gpus, errors="coerce").fillna(0)
+    sockets = np.fmax(np.ceil(cores / specs["Cores per Socket"]), nodes)
+    return (sockets * specs["Peak Memory Bandwidth [GB/s]"]).where(
+        ~((gpus > 0) & specs["GPU Peak Memory Bandwidth [GB/s]"].notna()),
+        gpus * specs["GPU Peak Memory Bandwidth [GB/s]"])
+
+# declarative description of the derived metrics, see metric
+#   column: name of the output column
+#   inputs: columns the metric is computed from, derived metrics are
+#       computed first
+#   compute: called with the input columns in the order of inputs
+Metric = collections.namedtuple("Metric", ["column", "inputs", "compute"])
+
+metric_table = (
+    Metric("Total Core Time [s]", ["Run Wall-Clock Time [s]", "Number of CPU Cores"], lambda t, n: t * n),
+    Metric("Total Node Time [s]", ["Run Wall-Clock Time [s]", "Number of Nodes"], lambda t, n: t * n),
+    # energy per iteration = tdp * dt [Ws]
+    Metric("Energy per Iteration [J]", ["System TDP [W]", "Time per Iteration [s]"], lambda p, t: p * t),
+    Metric("Energy per Iteration [kJ]", ["Energy per Iteration [J]"], lambda e: e / 1000),
+    # Total energy is based on the TDP since not all submissions provided (reliable) measurements
+    Metric("Energy-To-Solution [kWh]", ["Energy per Iteration [J]"], lambda e: e * 4/3600),
+    # Total WCT is based on the WCT/iteration since there were partial runs
+    Metric("Time-To-Solution [h]", ["Time per Iteration [s]"], lambda t: t * 4000/3600),
+    Metric("Core-Time-To-Solution [h]", ["Time-To-Solution [h]", "Number of CPU Cores"], lambda t, n: t * n),
+    Metric("Node-Time-To-Solution [h]", ["Time-To-Solution [h]", "Number of Nodes"], lambda t, n: t * n),
     # FVOPS (Finite VOlume Operations Per Second) definition available in
     # " Galeazzo, F.C.C., Weiß, R.G., Lesnik, S., Rusche, H., Ruopp, A., 2024.
     #   Understanding superlinear speedup in current HPC architectures. IOP Conf.
     #   Ser.: Mater. Sci. Eng. 1312, 012009.
     #   https://doi.org/10.1088/1757-899X/1312/1/012009 "
-    df["FVOPS"] = df["Number of Cells"] / df["Time per Iteration [s]"]
-    df = df.astype({"Run Consumed Energy [kWh]": "float", "Number of CPU Cores": "int" })
-    df["FVOPS per Energy"] = df["FVOPS"]/df["Energy per Iteration [J]"]
-    df["FVOPS per Energy per Iteration"] = df["FVOPS"]/df["Energy per Iteration [J]"]
-    df["FVOPS per Node"] = df["FVOPS"]/df["Number of Nodes"]
+    Metric("FVOPS", ["Number of Cells", "Time per Iteration [s]"], lambda c, t: c / t),
+    Metric("FVOPS per Energy", ["FVOPS", "Energy per Iteration [J]"], lambda f, e: f / e),
+    Metric("FVOPS per Node", ["FVOPS", "Number of Nodes"], lambda f, n: f / n),
+    Metric("FVOPS per Core", ["FVOPS", "Number of CPU Cores"], lambda f, n: f / n),
+    Metric("Peak Memory Bandwidth [GB/s]", [
+        "Number of CPU Cores", "Number of Nodes", "Number of GPU Devices",
+        "CPU Family", "CPU Model", "CPU Submodel", "CPU Generation", "GPU Model"], peak_memory_bandwidth),
+    Metric("FVOPS per GB/s", ["FVOPS", "Peak Memory Bandwidth [GB/s]"], lambda f, b: f / b),
+    Metric("Pre-Processing Wall-Clock Time [h]", ["Pre-Processing Wall-Clock Time [s]"],
+           lambda t: pd.to_numeric(t, errors="coerce") / 3600),
+    Metric("Pre-Processing-To-Run Time Ratio", ["Pre-Processing Wall-Clock Time [h]", "Time-To-Solution [h]"],
+           lambda p, t: p / t),
+)
+
+metrics = {m.column: m for m in metric_table}
+
+def register_metric(column, inputs):
+    """ decorator registering compute as derived metric column, see Metric
 
+    Example:
+        @op.register_metric("Cells per Core", ["Number of Cells", "Number of CPU Cores"])
+        def cells_per_core(cells, cores):
+            return cells / cores
+    """
+    def register(compute):
+        metrics[column] = Metric(column, list(inputs), compute)
+        return compute
+    return register
+
+def column_hash(df, column, hashes):
+    """ returns the hash of the values of a column of df, hashes caches them during a derive_metrics call"""
+    if column not in hashes:
+        hashes[column] = hashlib.sha256(pd.util.hash_pandas_object(df[column], index=False).values.tobytes()).hexdigest()
+    return hashes[column]
+
+def metric(df, column, hashes=None):
+    """ returns the derived metric column of df, it is computed and added to df if needed
+
+    The hash of the inputs of every computed metric is kept in
+    df.attrs["metrics"], a metric is only recomputed if its inputs changed,
+    e.g. after a column was corrected or for a subset of the rows.
+    """
+    hashes = {} if hashes is None else hashes
+    m = metrics[column]
+    for name in m.inputs:
+        if name in metrics:
+            metric(df, name, hashes)
+    key = ":".join(column_hash(df, name, hashes) for name in m.inputs)
+    computed = df.attrs.setdefault("metrics", {})
+    if column not in df.columns or computed.get(column) != key:
+        df[column] = m.compute(*(df[name] for name in m.inputs))
+        computed[column] = key
+        hashes.pop(column, None)
+    return df[column]
+
+@profiled("derive_metrics")
+def derive_metrics(df, columns=None):
+    """ adds the derived metrics columns, all registered metrics by default, to df and returns it
+
+    Only the requested metrics and their inputs are computed, and only if
+    their inputs changed since they were computed last, see metric.
+    """
+    for col, dtype in {"Run Consumed Energy [kWh]": "float", "Number of CPU Cores": "int"}.items():
+        if df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+    hashes = {}
+    for column in metrics if columns is None else columns:
+        metric(df, column, hashes)
+    return df
+
+# force coefficients of the histories and the columns of their submitted means
+force_coefficients = {"Cd": "cd_mean", "Cl": "cl_mean", "Cs": "cs_mean"}
+
+def convergence_iterations(dff, dff_files=None, tolerance=0.01, atol=0.01, window=500, final_window=1000):
+    """ returns the iteration from which the force coefficients of every history are converged
+
+    A coefficient is converged from the first iteration after which its
+    rolling mean over window iterations stays within a tolerance band around
+    its final mean, i.e. the submitted cd_mean and friends or if missing the
+    mean of the last final_window iterations. The band is tolerance times the
+    absolute final mean but at least atol (10 counts), since Cl and Cs are
+    close to zero and oscillate strongly. The submitted means are taken from
+    the per file values dff_files, see collect_submissions, or from the
+    columns of dff if they are joined onto it.
+    All histories of the forces frame dff are processed at once. Returns one
+    row per Filename with the converged iteration per coefficient, their
+    maximum as Converged Iteration, the recorded wall-clock time to reach
+    it and the recorded time per iteration of the history. Non-finite values
+    are ignored by the means. Histories which do not converge get missing
+    values.
+    """
+    group = dff.groupby("Filename", observed=True, sort=False).ngroup().to_numpy()
+    iteration = dff["Iteration"].to_numpy(dtype=float)
+    order = np.lexsort((iteration, group))
+    group, iteration = group[order], iteration[order]
+    num_groups = group.max() + 1 if len(group) else 0
+    num_rows = np.bincount(group, minlength=num_groups)
+    start = np.cumsum(num_rows) - num_rows
+    row = np.arange(len(group))
+    position = row - start[group]
+    from_end = num_rows[group] - position
+
+    out = pd.DataFrame({"Filename": dff["Filename"].to_numpy()[order][start]})
+    files = out["Filename"].astype(str)
+    if dff_files is not None:
+        # indexed by Filename or, e.g. loaded from the store, with a Filename column
+        file_means = dff_files.set_index("Filename") if "Filename" in dff_files else dff_files
+        file_means = file_means.set_axis(file_means.index.astype(str))
+    converged_row = start.copy()
+    is_converged = np.ones(num_groups, dtype=bool)
+    for coefficient, mean_column in force_coefficients.items():
+        values = dff[coefficient].to_numpy(dtype=float)[order]
+        # non-finite values are left out of the means, thus they don't spoil
+        # the sums of the following histories
+        finite = np.isfinite(values)
+        values = np.where(finite, values, 0.0)
+        in_final = from_end <= final_window
+        with np.errstate(invalid="ignore", divide="ignore"):
+            final = (np.bincount(group, np.where(in_final, values, 0), minlength=num_groups)
+                     / np.bincount(group, in_final & finite, minlength=num_groups))
+        if dff_files is not None:
+            submitted = files.map(file_means[mean_column]).to_numpy(dtype=float)
+        elif mean_column in dff:
+            submitted = pd.to_numeric(dff[mean_column], errors="coerce").to_numpy(dtype=float)[order][start]
+        else:
+            submitted = np.full(num_groups, np.nan)
+        final = np.where(np.isfinite(submitted), submitted, final)
+
+        # rolling mean from the cumulative sums, only windows within a history are valid
+        cumsum = np.concatenate([[0], np.cumsum(values)])
+        count = np.concatenate([[0], np.cumsum(finite)])
+        first = np.maximum(row + 1 - window, start[group])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rolling = (cumsum[row + 1] - cumsum[first]) / (count[row + 1] - count[first])
+        rolling[position < window - 1] = np.nan
+
+        band = np.maximum(tolerance * np.abs(final), atol)
+        outside = ~(np.abs(rolling - final[group]) <= band[group])
+        first_inside = np.zeros(num_groups, dtype=int)
+        np.maximum.at(first_inside, group[outside], position[outside] + 1)
+        inside = first_inside < num_rows
+        out[f"{coefficient} Converged Iteration"] = np.where(
+            inside, iteration[start + np.minimum(first_inside, num_rows - 1)], np.nan)
+        converged_row = np.maximum(converged_row, start + first_inside)
+        is_converged &= inside
+
+    converged_row = np.minimum(converged_row, start + num_rows - 1)
+    wct = pd.to_numeric(dff["Run Wall-Clock Time [s]"], errors="coerce").to_numpy(dtype=float)[order]
+    out["Converged Iteration"] = np.where(is_converged, iteration[converged_row], np.nan)
+    out["Number of Iterations"] = iteration[start + num_rows - 1]
+    out["Recorded Time-To-Converged-Solution [h]"] = np.where(is_converged, wct[converged_row] / 3600, np.nan)
+    last = start + num_rows - 1
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out["Recorded Time per Iteration [s]"] = (wct[last] - wct[start]) / (iteration[last] - iteration[start])
+    return out
+
+def join_convergence(df, dfc, tolerance=0.25):
+    """ adds the time- and energy-to-converged-solution to the derive_metrics output df
+
+    Uses the Converged Iteration of convergence_iterations of the history
+    submitted in the same file, instead of the 4000 iterations of
+    Time-To-Solution [h] and Energy-To-Solution [kWh]. A file has a single
+    history, it belongs to the only run of the file or else to the run whose
+    Time per Iteration [s] is closest to the recorded one, within tolerance.
+    This run gets the Recorded Time-To-Converged-Solution [h], the other runs
+    the time of their Time per Iteration [s]. The energy is based on the TDP
+    like Energy-To-Solution [kWh].
+    """
+    dfc = dfc.set_index(dfc["Filename"].astype(str))
+    files = df["File Name"].astype(str)
+    converged = files.map(dfc["Converged Iteration"])
+    time_per_iteration = pd.to_numeric(df["Time per Iteration [s]"], errors="coerce")
+    deviation = np.abs(np.log(time_per_iteration / files.map(dfc["Recorded Time per Iteration [s]"])))
+    deviation = deviation.where(deviation <= np.log1p(tolerance))
+    closest = deviation == deviation.groupby(files).transform("min")
+    # only the first of equally close runs
+    closest &= closest.groupby(files).cumsum() == 1
+    is_recorded = (files.groupby(files).transform("size") == 1) | closest
+    df["Converged Iteration"] = converged
+    df["Time-To-Converged-Solution [h]"] = files.map(dfc["Recorded Time-To-Converged-Solution [h]"]).where(
+        is_recorded, time_per_iteration * converged / 3600)
+    df["Energy-To-Converged-Solution [kWh]"] = df["System TDP [W]"] * df["Time-To-Converged-Solution [h]"]/1000
     return df
 
+# groups of runs of which the strong scaling is analyzed, see fit_scaling
+scaling_groups = ["Contributor ID", "CPU Submodel", "Mesh", "Track"]
+
+# strong scaling models which are linear in their parameters, given as
+# parameter names, basis functions of the number of cores or nodes p and the
+# transformation of the time per iteration to which the basis is fitted
+scaling_models = {
+    "Amdahl": (
+        ["Serial Time [s]", "Parallel Time [s]"],
+        lambda p: [np.ones_like(p), 1 / p],
+        lambda t: t),
+    "Amdahl Communication": (
+        ["Serial Time [s]", "Parallel Time [s]", "Communication Time [s]"],
+        lambda p: [np.ones_like(p), 1 / p, np.log(p)],
+        lambda t: t),
+    "Power Law": (
+        ["Log Prefactor", "Exponent"],
+        lambda p: [np.ones_like(p), -np.log(p)],
+        np.log),
+}
+
+def scaling_runs(df, x="Number of CPU Cores", by=scaling_groups):
+    """ returns the valid runs of df with a group number per run for the scaling analysis"""
+    p = pd.to_numeric(df[x], errors="coerce").to_numpy(dtype=float)
+    t = pd.to_numeric(df["Time per Iteration [s]"], errors="coerce").to_numpy(dtype=float)
+    valid = np.isfinite(p) & np.isfinite(t) & (p > 0) & (t > 0)
+    df = df.loc[valid, by]
+    group = df.groupby(by, observed=True, dropna=False, sort=False).ngroup().to_numpy()
+    return df, group, p[valid], t[valid]
+
+def scaling_efficiency(df, x="Number of CPU Cores", by=scaling_groups, tolerance=0.05):
+    """ returns the speedup and parallel efficiency of every run relative to the smallest run of its group
+
+    The smallest run is the fastest run with the least cores (or nodes, see x)
+    of a group. Runs with a parallel efficiency above 1 + tolerance are
+    flagged as Superlinear.
+    """
+    runs, group, p, t = scaling_runs(df, x, by)
+    num_groups = group.max() + 1 if len(group) else 0
+    p_min = np.full(num_groups, np.inf)
+    np.minimum.at(p_min, group, p)
+    t_min = np.full(num_groups, np.inf)
+    at_min = p == p_min[group]
+    np.minimum.at(t_min, group[at_min], t[at_min])
+    speedup = t_min[group] / t
+    efficiency = speedup * p_min[group] / p
+    return runs.assign(**{
+        x: p,
+        "Time per Iteration [s]": t,
+        "Speedup": speedup,
+        "Parallel Efficiency": efficiency,
+        "Superlinear": efficiency > 1 + tolerance,
+    })
+
+def fit_scaling(df, x="Number of CPU Cores", by=scaling_groups, models=scaling_models):
+    """ fits the strong scaling models to the Time per Iteration of all groups at once
+
+    Since all models are linear in their parameters the least squares
+    problems of all groups are solved together from their per group normal
+    equations. Returns a tidy frame with one row per group, model and
+    parameter with the fitted Value, its Std Error, the R2 of the fit and the
+    Number of Runs. Groups with fewer distinct values of x than parameters
+    get missing values, groups with as many runs as parameters lack the
+    uncertainty.
+    """
+    runs, group, p, t = scaling_runs(df, x, by)
+    keys = runs.groupby(group, sort=True).first()
+    num_groups = len(keys)
+    num_runs = np.bincount(group, minlength=num_groups)
+    distinct = np.bincount(np.unique(np.stack([group, p]), axis=1)[0].astype(int), minlength=num_groups)
+
+    out = []
+    for model, (params, basis, transform) in models.items():
+        X = np.stack(basis(p), axis=1)
+        y = transform(t)
+        k = X.shape[1]
+        XtX = np.empty((num_groups, k, k))
+        Xty = np.empty((num_groups, k))
+        for i in range(k):
+            Xty[:, i] = np.bincount(group, X[:, i] * y, minlength=num_groups)
+            for j in range(i, k):
+                XtX[:, i, j] = XtX[:, j, i] = np.bincount(group, X[:, i] * X[:, j], minlength=num_groups)
+        # scale the columns for the conditioning, e.g. 1/p and log(p) differ by orders of magnitude
+        scale = np.sqrt(np.einsum("gii->gi", XtX))
+        scale[scale == 0] = 1
+        inverse = np.linalg.pinv(XtX / scale[:, :, None] / scale[:, None, :], hermitian=True)
+        inverse = inverse / scale[:, :, None] / scale[:, None, :]
+        beta = np.einsum("gij,gj->gi", inverse, Xty)
+
+        residual = y - np.einsum("ni,ni->n", X, beta[group])
+        ssr = np.bincount(group, residual**2, minlength=num_groups)
+        y_mean = np.bincount(group, y, minlength=num_groups) / num_runs
+        sst = np.bincount(group, (y - y_mean[group])**2, minlength=num_groups)
+        dof = num_runs - k
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sigma2 = np.where(dof > 0, ssr / dof, np.nan)
+            r2 = 1 - ssr / sst
+        std_error = np.sqrt(sigma2[:, None] * np.einsum("gii->gi", inverse))
+        determined = distinct >= k
+        beta[~determined] = np.nan
+        std_error[~determined] = np.nan
+        r2[~determined] = np.nan
+
+        for i, param in enumerate(params):
+            out.append(keys.assign(**{
+                "Model": model,
+                "Parameter": param,
+                "Value": beta[:, i],
+                "Std Error": std_error[:, i],
+                "R2": r2,
+                "Number of Runs": num_runs,
+            }))
+    if not out:
+        return pd.DataFrame()
+    return pd.concat(out, ignore_index=True)
+
+# metrics which are minimized by the default Pareto front, see pareto_ranks
+pareto_metrics = ["Time-To-Solution [h]", "Energy-To-Solution [kWh]", "Node-Time-To-Solution [h]"]
+
+def dominance_layers(values):
+    """ returns the dominance layer of every row of values where all columns are minimized
+
+    The rows are visited in lexicographic order so that a row can only be
+    dominated by rows visited before it, and only if it is not better in the
+    remaining columns. Since a row dominated by a member of layer l is also
+    dominated by a member of every layer before l, its layer is found by a
+    binary search over the layers. For two columns a layer is represented by
+    its smallest second value, which gives O(n log n). For three columns a
+    layer is represented by the staircase of its members in the last two
+    columns, a probe is a bisection of the staircase, which gives O(n log² n)
+    comparisons (the staircases are python lists, inserting into them moves
+    the following entries). For more columns every probe compares against
+    all members of the layer, which is O(n² d) in the worst case. Identical
+    rows get the same layer.
+    """
+    unique, inverse = np.unique(values, axis=0, return_inverse=True)
+    layers = np.empty(len(unique), dtype=int)
+    if unique.shape[1] == 2:
+        minima = []
+        for i, y in enumerate(unique[:, 1]):
+            layer = bisect.bisect_right(minima, y)
+            if layer == len(minima):
+                minima.append(y)
+            else:
+                minima[layer] = y
+            layers[i] = layer
+        return layers[inverse.reshape(-1)]
+
+    if unique.shape[1] == 3:
+        # staircases of the layers, y ascending and z strictly descending
+        ys = []
+        zs = []
+        for i, (y, z) in enumerate(unique[:, 1:].tolist()):
+            lo, hi = 0, len(ys)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                j = bisect.bisect_right(ys[mid], y) - 1
+                if j >= 0 and zs[mid][j] <= z:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo == len(ys):
+                ys.append([])
+                zs.append([])
+            layer_ys, layer_zs = ys[lo], zs[lo]
+            # remove the steps which are dominated by the new one
+            j = bisect.bisect_left(layer_ys, y)
+            k = j
+            while k < len(layer_ys) and layer_zs[k] >= z:
+                k += 1
+            layer_ys[j:k] = [y]
+            layer_zs[j:k] = [z]
+            layers[i] = lo
+        return layers[inverse.reshape(-1)]
+
+    members = []
+    for i, row in enumerate(unique):
+        lo, hi = 0, len(members)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if (unique[members[mid]] <= row).all(axis=1).any():
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(members):
+            members.append([])
+        members[lo].append(i)
+        layers[i] = lo
+    return layers[inverse.reshape(-1)]
+
+def pareto_ranks(df, columns=pareto_metrics, by=None, maximize=()):
+    """ returns the Pareto rank of every run, i.e. its dominance layer over columns
+
+    Rank 0 is the Pareto front, rank 1 the front of the remaining runs and so
+    on. The columns are minimized except for those in maximize. If by is
+    given the ranks are computed within each group, e.g. by=["Mesh"]. Runs
+    with missing values in columns get a missing rank.
+    """
+    values = df[columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    for i, column in enumerate(columns):
+        if column in maximize:
+            values[:, i] = -values[:, i]
+    valid = np.isfinite(values).all(axis=1)
+    ranks = np.full(len(df), -1)
+    if by is None:
+        groups = [np.flatnonzero(valid)]
+    else:
+        groups = [idx[valid[idx]] for idx in
+                  df.groupby(by, observed=True, dropna=False, sort=False).indices.values()]
+    for idx in groups:
+        if len(idx):
+            ranks[idx] = dominance_layers(values[idx])
+    return pd.Series(ranks, index=df.index, name="Pareto Rank").astype("Int64").mask(ranks < 0)
+
+def pareto_front(df, columns=pareto_metrics, by=None, maximize=()):
+    """ returns the runs of df which are not dominated in columns, see pareto_ranks"""
+    return df[pareto_ranks(df, columns, by, maximize) == 0]
+
 def save_fig(fig, fig_folder, name, do_save_fig=True, fig_dpi=600):
     if not do_save_fig:
         return
 
+    import matplotlib
+    if not os.environ.get("DISPLAY") and not os.environ.get("MPLBACKEND") and "matplotlib.pyplot" not in sys.modules:
+        matplotlib.use("Agg")
     pathlib.Path(fig_folder).mkdir(parents=True, exist_ok=True)
     fig_name = os.path.join(fig_folder, name+".png")
     print(f"saving figure to {fig_name}")
-    fig.savefig(fig_name, dpi=fig_dpi, bbox_inches='tight')
\ No newline at end of file
+    fig.savefig(fig_name, dpi=fig_dpi, bbox_inches='tight')
+
+# figures rendered by render_figures, see register_figure
+#   name: file name of the figure without suffix
+#   plot: called as plot(df) with the selected data, returns a figure or axes
+#   select: dict of column values the rows have to match (a list matches any
+#       of its values) or a callable returning the rows of df
+#   columns: the columns passed to plot, all by default
+#   folder, dpi: as for save_fig
+Figure = collections.namedtuple("Figure", ["name", "plot", "select", "columns", "folder", "dpi"])
+
+figures = {}
+
+def register_figure(name, select=None, columns=None, folder="figures", dpi=600):
+    """ decorator registering plot as figure name, see Figure and render_figures
+
+    Example:
+        @op.register_figure("TTS_ETS_coarse", {"Track": "Hardware Track", "Mesh": "coarse"},
+                            ["Energy-To-Solution [kWh]", "Time-To-Solution [h]", "CPU Family"])
+        def plot(df):
+            return sb.scatterplot(df, x="Energy-To-Solution [kWh]", y="Time-To-Solution [h]", hue="CPU Family")
+    """
+    def register(plot):
+        figures[name] = Figure(name, plot, select, columns, folder, dpi)
+        return plot
+    return register
+
+def select_figure_data(figure, df):
+    """ returns the rows and columns of df plotted by figure"""
+    if callable(figure.select):
+        df = figure.select(df)
+    elif figure.select:
+        mask = np.ones(len(df), dtype=bool)
+        for col, value in figure.select.items():
+            mask &= df[col].isin(value if isinstance(value, (list, tuple, set)) else [value]).values
+        df = df[mask]
+    if figure.columns is not None:
+        df = df[list(figure.columns)]
+    return df
+
+def figure_data_hash(df):
+    """ hashes the values, columns and dtypes of the plotted data"""
+    h = hashlib.sha256(repr([(col, str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()
+
+def figure_code_hash(figure):
+    """ hashes the source of the plot and select functions and the render settings
+
+    Helper functions called by plot are not part of the hash, use
+    force=True in render_figures if only those changed.
+    """
+    h = hashlib.sha256(repr((figure.columns, figure.dpi)).encode())
+    for f in (figure.plot, figure.select):
+        if callable(f):
+            try:
+                h.update(inspect.getsource(f).encode())
+            except (OSError, TypeError):
+                h.update(f.__code__.co_code + repr(f.__code__.co_consts).encode())
+        else:
+            h.update(repr(f).encode())
+    return h.hexdigest()
+
+def init_render_worker():
+    """ selects a non interactive backend in the worker processes of render_figures
+
+    The figures inherited from the parent process are closed.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    plt.close("all")
+
+def render_figure(name, df, file_name):
+    """ renders the registered figure name to file_name, returns the wall time or the error message
+
+    The plot function draws into a new current figure. Only the figures
+    opened while rendering are closed, thus the figures and the backend of
+    the caller are left alone.
+    """
+    import matplotlib
+    import matplotlib.pyplot as plt
+    start = time.perf_counter()
+    before = set(plt.get_fignums())
+    current = plt.gcf().number if before else None
+    try:
+        plt.figure()
+        fig = figures[name].plot(df)
+        if not isinstance(fig, matplotlib.figure.Figure):
+            fig = fig.get_figure() if fig is not None else plt.gcf()
+        fig.savefig(file_name, dpi=figures[name].dpi, bbox_inches='tight')
+        return time.perf_counter() - start
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    finally:
+        for num in set(plt.get_fignums()) - before:
+            plt.close(num)
+        if current is not None:
+            plt.figure(current)
+
+def render_figures(df, names=None, jobs=1, force=False, manifest=".ohc_cache/figures.json"):
+    """ renders the registered figures with the data of df, see register_figure
+
+    A figure is only rendered if its file is missing or the hash of its data
+    slice or of its plotting code differs from the last render, which is
+    recorded in the manifest. With jobs > 1 the figures are rendered in a
+    pool of jobs worker processes, jobs=None uses all available cores.
+    Returns a DataFrame with the Figure, File, Status (rendered, unchanged
+    or failed) and Wall Time [s] of every figure.
+    """
+    names = list(figures) if names is None else names
+    try:
+        with open(manifest) as f:
+            rendered = json.load(f)
+    except (OSError, ValueError):
+        rendered = {}
+
+    rows = {}
+    todo = []
+    for name in names:
+        figure = figures[name]
+        data = select_figure_data(figure, df)
+        file_name = os.path.join(figure.folder, name + ".png")
+        hashes = {"data": figure_data_hash(data), "code": figure_code_hash(figure)}
+        if not force and rendered.get(file_name) == hashes and os.path.exists(file_name):
+            rows[name] = (file_name, "unchanged", 0.0)
+            continue
+        pathlib.Path(figure.folder).mkdir(parents=True, exist_ok=True)
+        todo.append((name, data, file_name, hashes))
+
+    if jobs is None:
+        jobs = os.cpu_count()
+    args = [list(arg) for arg in zip(*todo)][:3]
+    # the workers look up the plot functions in the registry, which they only
+    # inherit if they are forked, plot functions of notebooks can't be pickled
+    if jobs > 1 and len(todo) > 1 and "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(todo)), mp_context=context,
+                                                    initializer=init_render_worker) as pool:
+            results = list(pool.map(render_figure, *args))
+    else:
+        results = list(map(render_figure, *args)) if todo else []
+
+    for (name, _, file_name, hashes), result in zip(todo, results):
+        if isinstance(result, str):
+            print(f"failed to render figure {name}: {result}")
+            rendered.pop(file_name, None)
+            rows[name] = (file_name, "failed", np.nan)
+        else:
+            print(f"saving figure to {file_name}")
+            rendered[file_name] = hashes
+            rows[name] = (file_name, "rendered", result)
+
+    pathlib.Path(manifest).parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest, "w") as f:
+        json.dump(rendered, f, indent=1)
+    return pd.DataFrame([(name, *rows[name]) for name in names],
+                        columns=["Figure", "File", "Status", "Wall Time [s]"])
+
+def build_store(folder_name="submissions", path="data_store", jobs=1, cache_dir=".ohc_cache", forces=True):
+    """ reads the submissions, derives the metrics and writes the data store, see export_store and export_sql
+
+    With a cache_dir only new or changed submissions are parsed, thus
+    repeated builds refresh the store.
+    """
+    dfs, dfsf, dff_files, diagnostics = collect_submissions(
+        folder_name, jobs, cache_dir, forces=forces, diagnostics=True, per_file=True)
+    dfs = derive_metrics(dfs)
+    # converted once such that coerced values are only recorded once
+    with diagnosing() as records:
+        runs = to_schema(dfs, run_dtypes, "runs")
+        files = to_schema(dff_files, force_files_dtypes, "force_files") if forces else None
+        forces = to_schema(dfsf, forces_dtypes, "forces") if forces else None
+    diagnostics = pd.concat([diagnostics, diagnostics_frame(records)], ignore_index=True)
+    export_store(runs, forces, path, files)
+    export_sql(runs, forces, os.path.join(path, "ohc.sqlite"), diagnostics, files)
+    print(f"wrote {len(dfs)} runs of {dfs['File Name'].nunique()} submissions to {path}, "
+          f"{len(diagnostics)} converted or missing values are listed in the diagnostics table")
+    return dfs
+
+def export_table(df, file_name):
+    """ writes df to file_name, the format is given by the suffix (.json, .csv, .parquet or .xlsx)
+
+    JSON is written as records like data.json.
+    """
+    suffix = pathlib.Path(file_name).suffix.lower()
+    if suffix == ".json":
+        df.to_json(file_name, orient="records", lines=False, indent=4)
+    elif suffix == ".csv":
+        df.to_csv(file_name, index=False)
+    elif suffix == ".parquet":
+        df.to_parquet(file_name, index=False)
+    elif suffix == ".xlsx":
+        df.to_excel(file_name, index=False)
+    else:
+        print(f"unknown export format {suffix} of {file_name}")
+        return False
+    print(f"exported {len(df)} rows to {file_name}")
+    return True
+
+# columns which are summarized by the summary command
+summary_groups = ["Track", "Mesh"]
+summary_metrics = ["Time per Iteration [s]", "Energy per Iteration [kJ]", "FVOPS", "Number of Nodes"]
+
+def summarize_store(df, by=summary_groups, metrics=summary_metrics):
+    """ returns the number of runs, submissions and contributors and the median metrics per group"""
+    metrics = [m for m in metrics if m in df.columns]
+    grouped = df.groupby([c for c in by if c in df.columns], observed=True)
+    out = grouped.agg(**{
+        "Number of Runs": ("File Name", "size"),
+        "Number of Submissions": ("File Name", "nunique"),
+        "Number of Contributors": ("Contributor ID", "nunique"),
+    })
+    return out.join(grouped[metrics].median().add_prefix("Median "))
+
+def main(argv=None):
+    """ command line interface, see python -m OHCParser --help"""
+    parser = argparse.ArgumentParser(prog="python -m OHCParser", description="builds and queries the OHC data store")
+    parser.add_argument("--store", default="data_store", help="folder of the data store")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", aliases=["refresh"], help="reads the submissions and writes the data store")
+    build.add_argument("--folder", default="submissions", help="folder or tar archive of the submissions")
+    build.add_argument("--jobs", type=int, default=1, help="number of worker processes, 0 uses all cores")
+    build.add_argument("--cache-dir", default=".ohc_cache", help="cache of parsed submissions, empty to disable")
+    build.add_argument("--no-forces", action="store_true", help="do not store the aero forces")
+
+    export = commands.add_parser("export", help="exports a table of the data store")
+    export.add_argument("output", nargs="?", default="data.json", help="output file (.json, .csv, .parquet or .xlsx)")
+    export.add_argument("--table", default="runs", choices=["runs", "forces", "force_files"])
+    export.add_argument("--columns", nargs="+", help="exported columns, all by default")
+
+    query = commands.add_parser("query", help="prints the result of a sql query on the data store")
+    query.add_argument("sql", help='e.g. SELECT Mesh, COUNT(*) FROM runs GROUP BY Mesh')
+    query.add_argument("--output", help="exports the result instead, see export")
+
+    summary = commands.add_parser("summary", help="prints summary statistics of the data store")
+    summary.add_argument("--by", nargs="+", default=summary_groups, help="columns to group by")
+
+    args = parser.parse_args(argv)
+    if args.command in ("build", "refresh"):
+        build_store(args.folder, args.store, args.jobs or None, args.cache_dir or None, not args.no_forces)
+    elif args.command == "export":
+        df = load_store(args.store, args.table, args.columns)
+        if not export_table(df, args.output):
+            return 1
+    elif args.command == "query":
+        df = query_store(args.sql, path=os.path.join(args.store, "ohc.sqlite"))
+        if args.output:
+            return 0 if export_table(df, args.output) else 1
+        with pd.option_context("display.width", 200, "display.max_columns", None, "display.max_rows", 500):
+            print(df.to_string(index=False))
+    elif args.command == "summary":
+        df = load_store(args.store)
+        print(f"{len(df)} runs of {df['File Name'].nunique()} submissions by {df['Contributor ID'].nunique()} contributors")
+        with pd.option_context("display.width", 200, "display.max_columns", None):
+            print(summarize_store(df, args.by))
+    return 0
+
+if __name__ == "__main__":
+    # run the imported module such that worker processes and module state,
+    # e.g. the profiler, refer to OHCParser and not to __main__
+    import OHCParser
+    sys.exit(OHCParser.main())
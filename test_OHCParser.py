@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+import OHCParser as op
+
+
+def test_split_iteration_times_single_iteration():
+    info, writes = op.split_iteration_times(np.array([5.0]), np.array([0]))
+    assert info["Number of Iterations"] == 1
+    assert info["Total Clock Time [s]"] == 5.0
+    assert np.isnan(info["Steady-State Time per Iteration [s]"])
+    assert np.isnan(info["Startup Iterations"])
+    assert np.isnan(info["Startup Time [s]"])
+    assert writes.tolist() == [False]
+
+
+def test_io_overhead_single_iteration_log():
+    dft = pd.DataFrame({"Case": ["a", "b", "b", "b"], "Run": [0, 0, 0, 0], "Segment": [0, 0, 0, 0],
+                        "Iteration": [1, 1, 2, 3], "Clock Time [s]": [5.0, 5.0, 6.0, 7.0]})
+    dfio = op.io_overhead(dft).set_index("Case")
+    assert np.isnan(dfio.loc["a", "Steady-State Time per Iteration [s]"])
+    assert dfio.loc["b", "Steady-State Time per Iteration [s]"] == 1.0